@@ -1,33 +1,48 @@
 import sys
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize OpenAI client with API key
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise ValueError("The OPENAI_API_KEY environment variable is not set.")
-
-client = OpenAI(api_key=api_key)
-
 # Ensure Python can find the `modules/` folder
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st
 import pandas as pd
-from modules.fetch_news import fetch_news
-from modules.sentiment import analyze_sentiment
-from modules.gov_news_agent import fetch_regulations_gov_news
-from modules.langchain_agent import ask_question  # Local Chatbot
-from modules.multi_agent import ask_multi_agent    # Multi-agent integrating local and web search
-from modules.ai_agent import interpret_query
-from modules.price_agent import PriceAgent
+from modules.snapshot import build_snapshot, load_snapshot, snapshot_is_current, snapshot_version
+
+# Agents, LangChain, OpenAI and matplotlib are imported inside the tab that
+# uses them, so the first paint only pays for streamlit, pandas and the snapshot.
+
+@st.cache_resource
+def get_openai_client():
+    """Creates the OpenAI client on first use and shares it across sessions."""
+    from openai import OpenAI
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("The OPENAI_API_KEY environment variable is not set.")
+    return OpenAI(api_key=api_key)
+
+def write_answer(events):
+    """
+    Streams an agent's answer into the current chat message and shows the
+    tools it calls as a status line above it. Returns the answer text only.
+    """
+    from modules.streaming import answer_tokens
+
+    status = st.empty()
+    tools = []
+
+    def on_tool(name):
+        tools.append(name)
+        status.caption("🔧 Using " + ", ".join(tools) + "…")
+
+    return st.write_stream(answer_tokens(events, on_tool))
 
 def generate_ai_response(prompt):
-    response = client.chat.completions.create(
+    response = get_openai_client().chat.completions.create(
         model="gpt-3.5-turbo",  # or "gpt-4" if available to you
         messages=[
             {"role": "user", "content": prompt}
@@ -87,46 +102,30 @@ all_tabs = existing_tabs + [f"{file}" for file in module_files]
 # Create tab objects
 all_tab_objects = st.tabs(all_tabs)
 
+@st.cache_resource(max_entries=2)
+def get_snapshot(version):
+    """Loads (memory-maps) one snapshot version; reruns reuse it until the daemon writes a new one."""
+    return load_snapshot()
+
+# The ingestion daemon (main.py) keeps the snapshot current; without it, rebuild from
+# local data whenever the article store has moved on (cached price bars only, no API calls)
+if not snapshot_is_current():
+    build_snapshot(local_only=True)
+snapshot = get_snapshot(snapshot_version())
+
 # Display content for each existing tab
 with all_tab_objects[0]:
-    st.info("🔄 Fetching latest news...")
-    articles = fetch_news()
+    articles = snapshot.articles
 
     if not articles:
-        st.error("❌ No articles found. Please check the API connection.")
+        st.error("❌ No articles found. Is the ingestion daemon (python main.py) running?")
         st.stop()
 
-    # Create DataFrame
+    # Create DataFrame from the precomputed articles and sentiment arrays
     df = pd.DataFrame(articles)
     df["content"] = df["content"].fillna("")
-    
-    # Combine title and content for better sentiment analysis
-    df["full_text"] = df["title"] + " " + df["content"]
-    
-    # Process sentiment analysis for all articles
-    sentiments = []
-    sentiment_scores = []
-
-    for text in df["full_text"]:
-        sentiment_result = analyze_sentiment(text)
-        print(f"Sentiment Result: {sentiment_result}")  # Debugging line
-        sentiment_lines = sentiment_result.split('\n')
-        
-        if len(sentiment_lines) > 1 and ': ' in sentiment_lines[0]:
-            overall_sentiment = sentiment_lines[0].split(': ')[1]
-        else:
-            overall_sentiment = "Neutral"
-        
-        if len(sentiment_lines) > 1 and ': ' in sentiment_lines[1]:
-            polarity_score = float(sentiment_lines[1].split(': ')[1])
-        else:
-            polarity_score = 0.0
-        
-        sentiments.append(overall_sentiment)
-        sentiment_scores.append(polarity_score)
-    
-    df["sentiment"] = sentiments
-    df["sentiment_score"] = sentiment_scores
+    df["sentiment"] = snapshot.arrays["sentiment.labels"]
+    df["sentiment_score"] = snapshot.arrays["sentiment.polarity"]
 
     # Display news with sentiment
     st.subheader("📰 Latest Cryptocurrency News")
@@ -138,11 +137,11 @@ with all_tab_objects[0]:
     st.subheader("📊 Sentiment Analysis Breakdown")
     
     # Create sentiment distribution chart
-    sentiment_counts = df["sentiment"].value_counts()
+    sentiment_counts = pd.Series(snapshot.aggregates["label_counts"], name="count")
     st.bar_chart(sentiment_counts)
     
     # Display average sentiment score
-    avg_sentiment = df["sentiment_score"].mean()
+    avg_sentiment = snapshot.aggregates["avg_polarity"]
     st.metric("Average Sentiment Score", f"{avg_sentiment:.2f}", 
               delta="Positive" if avg_sentiment > 0 else "Negative" if avg_sentiment < 0 else "Neutral")
 
@@ -162,9 +161,10 @@ with all_tab_objects[1]:
         st.session_state.messages.append({"role": "user", "content": user_input})
         st.chat_message("user").markdown(user_input)
 
-        response = ask_question(user_input)
+        from modules.langchain_agent import stream_question  # Local Chatbot
+        with st.chat_message("assistant"):
+            response = write_answer(stream_question(user_input))
         st.session_state.messages.append({"role": "assistant", "content": response})
-        st.chat_message("assistant").markdown(response)
 
 with all_tab_objects[2]:
     st.subheader("🌐 Chat with the Multi-Agent (Local & Web Search)")
@@ -180,22 +180,27 @@ with all_tab_objects[2]:
         st.session_state.multi_messages.append({"role": "user", "content": user_input_multi})
         st.chat_message("user").markdown(user_input_multi)
 
-        response_multi = ask_multi_agent(user_input_multi)
+        from modules.multi_agent import stream_multi_agent  # Multi-agent integrating local and web search
+        with st.chat_message("assistant"):
+            response_multi = write_answer(stream_multi_agent(user_input_multi))
         st.session_state.multi_messages.append({"role": "assistant", "content": response_multi})
-        st.chat_message("assistant").markdown(response_multi)
 
 # Update the Graph tab to fetch and display crypto price data.
-from modules.graph_viz import display_crypto_graph
-
 with all_tab_objects[3]:
+    from modules.graph_viz import display_crypto_graph
+
     st.subheader("📈 Graph")
     
     ticker = st.text_input("Enter a crypto ticker (e.g., BTC-USD):", value="BTC-USD")
     
     days = st.number_input("How many days of historical data?", min_value=1, max_value=5000, value=365)
 
+    interactive = st.toggle("Interactive chart", value=False)
+
     if ticker:
-        display_crypto_graph(ticker, days)
+        # Tickers the daemon tracks are drawn from the snapshot without touching the price API
+        display_crypto_graph(ticker, days, interactive=interactive,
+                             prices=snapshot.price_frame(ticker, days), events=snapshot.events or None)
 
 with all_tab_objects[4]:
     st.subheader("🤖 AI Agent Chat")
@@ -213,9 +218,10 @@ with all_tab_objects[4]:
         st.chat_message("user").markdown(user_input_ai)
 
         # Use interpret_query to generate response
-        response_ai = interpret_query(user_input_ai)
+        from modules.ai_agent import stream_query
+        with st.chat_message("assistant"):
+            response_ai = write_answer(stream_query(user_input_ai))
         st.session_state.ai_messages.append({"role": "assistant", "content": response_ai})
-        st.chat_message("assistant").markdown(response_ai)
 
 # Display content for each new module tab
 for i, file in enumerate(module_files, start=len(existing_tabs)):
@@ -235,6 +241,9 @@ for i, file in enumerate(module_files, start=len(existing_tabs)):
 
             # Specific logic for sentiment.py
             if file == 'sentiment.py':
+                from modules.fetch_news import fetch_news
+                from modules.gov_news_agent import fetch_regulations_gov_news
+                from modules.sentiment import analyze_sentiment
                 try:
                     # Extract keyword and number from user input
                     words = user_input.split()
@@ -258,6 +267,7 @@ for i, file in enumerate(module_files, start=len(existing_tabs)):
                 except Exception as e:
                     response = f"Could not perform sentiment analysis. Error: {str(e)}"
             elif file == 'gov_news_agent.py':
+                from modules.gov_news_agent import fetch_regulations_gov_news
                 try:
                     # Extract keyword and number from user input
                     words = user_input.split()
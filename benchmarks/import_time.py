@@ -0,0 +1,101 @@
+"""
+Import-time benchmark for the dashboard's and agents' entry modules.
+
+Each target is imported in a fresh interpreter under `python -X importtime`;
+the report shows the median total import time per target and the heaviest
+top-level packages it pulled in. Run from the repository root:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 5 --json benchmarks/import_time.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+TARGETS = [
+    "config.settings",
+    "modules.snapshot",
+    "modules.sentiment",
+    "modules.graph_viz",
+    "modules.langchain_agent",
+    "modules.multi_agent",
+    "modules.ai_agent",
+    "modules.scheduler",
+]
+
+
+def parse_importtime(stderr: str) -> list:
+    """Returns (package, self_us, cumulative_us, depth) for each -X importtime line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(target: str) -> dict:
+    """Imports `target` once in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    rows = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+        return {"ok": False, "error": error}
+
+    # A module's line follows those of everything it imported, indented one level deeper
+    end = next(i for i, row in enumerate(rows) if row[0] == target)
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    direct = sorted(((cumulative, name) for name, _, cumulative, depth in rows[start:end] if depth == 1), reverse=True)
+    return {"ok": True, "total_us": rows[end][2], "top": [(name, cumulative) for cumulative, name in direct[:5]]}
+
+
+def run(targets, runs: int) -> dict:
+    report = {}
+    for target in targets:
+        samples = [measure(target) for _ in range(runs)]
+        failed = next((sample for sample in samples if not sample["ok"]), None)
+        if failed:
+            report[target] = failed
+            continue
+        report[target] = {
+            "ok": True,
+            "median_ms": statistics.median(sample["total_us"] for sample in samples) / 1000,
+            "top": samples[-1]["top"],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=TARGETS, help="Modules to import (default: entry modules)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per target; the median is reported")
+    parser.add_argument("--json", help="Also write the report to this path")
+    args = parser.parse_args()
+
+    report = run(args.targets, args.runs)
+    for target, result in report.items():
+        if not result["ok"]:
+            print(f"❌ {target:<26} {result['error']}")
+            continue
+        heaviest = ", ".join(f"{name} {cumulative / 1000:.0f}ms" for name, cumulative in result["top"])
+        print(f"⏱️ {target:<26} {result['median_ms']:8.1f} ms   {heaviest}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
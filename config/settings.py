@@ -9,22 +9,52 @@ API_KEYS = {
     "financialdatasets": os.getenv("FINANCIAL_DATASETS_API_KEY"),
 }
 
+# Each source keeps its own publishedAt cursor; add queries as extra URLs
 NEWS_SOURCES = [
     "https://newsapi.org/v2/everything?q=cryptocurrency"
 ]
 
-# Optional debug messages clearly verifying keys
-if not API_KEYS["openai"]:
-    print("❌ ERROR: OpenAI API Key is missing!")
-else:
-    print(f"✅ OpenAI API Key Loaded: {API_KEYS['openai'][:10]}********")
-
-if not API_KEYS["newsapi"]:
-    print("❌ ERROR: NewsAPI Key is missing!")
-else:
-    print(f"✅ NewsAPI Key Loaded: {API_KEYS['newsapi'][:10]}********")
-
-if not API_KEYS["financialdatasets"]:
-    print("❌ ERROR: Financial Datasets API Key is missing!")
-else:
-    print(f"✅ Financial Datasets API Key Loaded: {API_KEYS['financialdatasets'][:10]}********")
+NEWS_SETTINGS = {
+    "page_size": int(os.getenv("NEWS_PAGE_SIZE", "100")),  # NewsAPI maximum
+    "max_pages": int(os.getenv("NEWS_MAX_PAGES", "5")),
+    "latest_limit": int(os.getenv("NEWS_LATEST_LIMIT", "100")),
+}
+
+# Shared HTTP client (modules/http_client.py)
+HTTP_SETTINGS = {
+    "connect_timeout": float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05")),
+    "read_timeout": float(os.getenv("HTTP_READ_TIMEOUT", "15")),
+    "max_retries": int(os.getenv("HTTP_MAX_RETRIES", "3")),
+    "backoff_base": float(os.getenv("HTTP_BACKOFF_BASE", "0.5")),
+    "backoff_max": float(os.getenv("HTTP_BACKOFF_MAX", "8")),
+    "max_connections_per_host": int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8")),
+}
+
+# Ingestion daemon (modules/scheduler.py, started by main.py)
+SCHEDULER_SETTINGS = {
+    "news_interval_minutes": int(os.getenv("NEWS_INTERVAL_MINUTES", "60")),
+    "regulations_interval_hours": int(os.getenv("REGULATIONS_INTERVAL_HOURS", "24")),
+    "prices_interval_minutes": int(os.getenv("PRICES_INTERVAL_MINUTES", "60")),
+    "price_tickers": os.getenv("PRICE_TICKERS", "BTC-USD,ETH-USD").split(","),
+    "price_history_days": int(os.getenv("PRICE_HISTORY_DAYS", "365")),
+    "jitter_seconds": float(os.getenv("SCHEDULER_JITTER_SECONDS", "30")),
+    "metrics_port": int(os.getenv("METRICS_PORT", "9108")),
+}
+
+
+def report_api_keys():
+    """Optional debug messages clearly verifying keys (call from entry points, not on import)."""
+    if not API_KEYS["openai"]:
+        print("❌ ERROR: OpenAI API Key is missing!")
+    else:
+        print(f"✅ OpenAI API Key Loaded: {API_KEYS['openai'][:10]}********")
+
+    if not API_KEYS["newsapi"]:
+        print("❌ ERROR: NewsAPI Key is missing!")
+    else:
+        print(f"✅ NewsAPI Key Loaded: {API_KEYS['newsapi'][:10]}********")
+
+    if not API_KEYS["financialdatasets"]:
+        print("❌ ERROR: Financial Datasets API Key is missing!")
+    else:
+        print(f"✅ Financial Datasets API Key Loaded: {API_KEYS['financialdatasets'][:10]}********")
@@ -1,15 +1,14 @@
-import schedule
-import time
-from modules.fetch_news import fetch_news
-from modules.summarizer import summarize_articles
+import asyncio
+from config.settings import report_api_keys
+from modules.scheduler import build_daemon
 
-def job():
-    fetch_news()  # Fetch & save news
-    summarize_articles()  # Summarize articles
+report_api_keys()
 
-schedule.every(1).hours.do(job)
+# News, regulations and prices each run on their own cadence (see SCHEDULER_SETTINGS)
+daemon = build_daemon()
 
 print("🔄 Crypto News Agent is running... (Ctrl+C to stop)")
-while True:
-    schedule.run_pending()
-    time.sleep(60)
+try:
+    asyncio.run(daemon.run_forever())
+except KeyboardInterrupt:
+    print("👋 Crypto News Agent stopped.")
@@ -0,0 +1,42 @@
+import threading
+
+# name -> (version, agent)
+_agents = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _lock_for(name):
+    with _registry_lock:
+        return _locks.setdefault(name, threading.Lock())
+
+
+def get_agent(name: str, factory, version=None):
+    """
+    Returns the process-wide agent registered under `name`.
+
+    The agent is built with `factory()` on first use and reused across
+    Streamlit reruns and threads. Passing a `version` (e.g. the article
+    corpus version) rebuilds the agent whenever that version changes.
+    """
+    entry = _agents.get(name)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _lock_for(name):
+        # Another thread may have built it while we waited
+        entry = _agents.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        agent = factory()
+        _agents[name] = (version, agent)
+        return agent
+
+
+def invalidate(name: str = None):
+    """Drops one cached agent, or all of them when `name` is None."""
+    with _registry_lock:
+        if name is None:
+            _agents.clear()
+        else:
+            _agents.pop(name, None)
@@ -1,42 +1,44 @@
-from modules.fetch_news import fetch_news
 from modules.sentiment import analyze_sentiment
-from modules.price_agent import PriceAgent
-from modules.gov_news_agent import fetch_regulations_gov_news
 from modules.summarizer import summarize_articles
-from modules.multi_agent import ask_multi_agent
-from modules.sentiment_agent import ask_sentiment_agent
-import os
+from modules.multi_agent import ask_multi_agent, ask_sentiment_agent
+from modules.price_agent import format_quotes
+from modules.request_context import request_context, get_news, get_price, get_quotes, get_regulations
+from modules.task_graph import TaskGraph
+from modules import router
 
 
 def collect_data():
-    # Fetch news articles
-    articles = fetch_news()
-    # Analyze sentiment
-    sentiment_results = analyze_sentiment(articles)
-    # Fetch price data
-    price_agent = PriceAgent()
-    price_data = price_agent.get_crypto_price("BTC")
-    # Fetch regulatory news
-    regulatory_news = fetch_regulations_gov_news("your_api_key")
-    # Fetch summarized articles
-    summarized_articles = summarize_articles()
-
+    """
+    Collects news, prices, regulations, sentiment, summaries and multi-agent
+    insights. Independent fetches run concurrently and dependent stages start
+    as soon as the news arrives; a failed or timed-out stage yields None and
+    is listed in the returned "stage_report".
+    """
+    graph = TaskGraph()
+    graph.add("articles", get_news, timeout=30)
+    graph.add("price_data", lambda: get_price("BTC"), timeout=30)
+    graph.add("regulatory_news", get_regulations, timeout=30)
+    graph.add("sentiment", lambda articles: analyze_sentiment(articles), deps=["articles"], timeout=30)
+    graph.add("summarized_articles", lambda articles: summarize_articles(articles), deps=["articles"], timeout=120)
     # Use multi-agent to gather additional insights
-    multi_agent_insights = ask_multi_agent("Provide insights on current crypto trends.")
+    graph.add("multi_agent_insights", lambda: ask_multi_agent("Provide insights on current crypto trends."),
+              timeout=120)
 
-    # Initialize PriceAgent
-    price_agent = PriceAgent()
-    # Fetch Bitcoin price
-    bitcoin_price = price_agent.get_crypto_price("BTC")
+    # Every upstream API is hit at most once for the whole collection,
+    # including by the multi-agent's tools
+    with request_context():
+        report = graph.run()
 
+    results = report["results"]
     return {
-        "articles": articles,
-        "summarized_articles": summarized_articles,
-        "sentiment": sentiment_results,
-        "price_data": price_data,
-        "regulatory_news": regulatory_news,
-        "multi_agent_insights": multi_agent_insights,
-        "bitcoin_price": bitcoin_price
+        "articles": results.get("articles"),
+        "summarized_articles": results.get("summarized_articles"),
+        "sentiment": results.get("sentiment"),
+        "price_data": results.get("price_data"),
+        "regulatory_news": results.get("regulatory_news"),
+        "multi_agent_insights": results.get("multi_agent_insights"),
+        "bitcoin_price": results.get("price_data"),
+        "stage_report": {"timings": report["timings"], "errors": report["errors"]}
     }
 
 
@@ -48,86 +50,90 @@ def predict_market_trends(data):
 
 def get_crypto_price(ticker: str) -> str:
     """Fetches the latest price for the specified cryptocurrency ticker."""
-    price_agent = PriceAgent()
-    return price_agent.get_crypto_price(ticker)
+    return get_price(ticker)
 
 
 def interpret_query(query: str) -> str:
     """Interprets the user's query and fetches data from the appropriate module."""
-    print(f"Received query: {query}")  # Debugging output
-    query = query.lower()
-    if any(word in query for word in ["sentiment", "tone", "positive", "negative", "emotion", "feeling"]):
-        print("Forwarding sentiment query to sentiment agent...")
-        return ask_sentiment_agent(query)
-    elif "price" in query or "cost" in query or "value" in query:
-        print("Interpreting as a price query.")  # Debugging output
-        # Map common cryptocurrency names to their ticker symbols
-        crypto_map = {
-            "bitcoin": "BTC",
-            "ethereum": "ETH",
-            "litecoin": "LTC",
-            "ripple": "XRP",
-            "cardano": "ADA",
-            # Add more cryptocurrencies as needed
-        }
-        # Extract ticker symbol or name from query
-        words = query.split()
-        for word in words:
-            print(f"Checking word: {word}")  # Debugging output
-            if word.upper() in crypto_map.values():
-                print(f"Fetching price for ticker: {word.upper()}")  # Debugging output
-                return get_crypto_price(word.upper())
-            elif word in crypto_map:
-                print(f"Fetching price for cryptocurrency: {word}")  # Debugging output
-                return get_crypto_price(crypto_map[word])
+    with request_context():
+        return _interpret_query(query)
+
+
+def stream_query(query: str):
+    """
+    Streams interpret_query's answer as StreamEvents. Its routes are plain
+    function calls, so the answer arrives as a single chunk.
+    """
+    from modules.streaming import stream_call
+    return stream_call(interpret_query, query)
+
+
+def _price_answer(query, route):
+    if not route.tickers:
         return "Please specify a valid cryptocurrency ticker or name."
-    elif "news" in query:
-        print("Interpreting as a news query.")  # Debugging output
-        articles = fetch_news()
-        if not articles:
-            return "No recent cryptocurrency news available."
-        lines = []
-        for article in articles[:5]:
-            if not article:
-                continue
-            title = article.get('title') or 'Untitled'
-            url = article.get('url') or '#'
-            lines.append(f"- {title} ({url})")
-        return "Here are the latest crypto news articles:\n" + "\n".join(lines)
-    elif "summarize" in query or "summary" in query:
-        print("Interpreting as a summarization query.")  # Debugging output
-        summaries = summarize_articles()
-        if not summaries:
-            return "No articles available to summarize."
-        return "Here are the summaries of the latest articles:\n" + "\n".join([f"- {summary.get('title', 'Untitled') or 'Untitled'}: {summary.get('summary', 'No summary available') or 'No summary available'}" for summary in summaries])
-    elif "graph" in query or "chart" in query:
-        print("Interpreting as a graph query.")  # Debugging output
-        # Assuming a default ticker and days for demonstration
-        ticker = "BTC-USD"
-        days = 365
-        display_crypto_graph(ticker, days)
-        return "Displaying the graph for Bitcoin (BTC-USD) over the past year."
-    elif "day" in query or "date" in query:
-        from datetime import datetime
-        current_date = datetime.now().strftime("%B %d, %Y")
-        return f"Today's date is {current_date}."
-    elif "sentiment" in query:
-        print("Interpreting as a sentiment query.")  # Debugging output
-        articles = fetch_news()
-        if not articles:
-            return "No news available to analyze sentiment."
-        # Ensure clean articles are passed to analyze_sentiment
-        clean_articles = [{
-            'title': article.get('title', '') or '',
-            'content': article.get('content', '') or ''
-        } for article in articles]
-        sentiment_result = analyze_sentiment(clean_articles)
-        return "Sentiment Analysis Result:\n" + str(sentiment_result)
-
-    else:
-        print("Query type not recognized.")  # Debugging output
+    print(f"Fetching prices for: {', '.join(route.tickers)}")  # Debugging output
+    return format_quotes(get_quotes(route.tickers))
+
+
+def _news_answer(query, route):
+    articles = get_news()
+    if not articles:
+        return "No recent cryptocurrency news available."
+    lines = []
+    for article in articles[:5]:
+        if not article:
+            continue
+        title = article.get('title') or 'Untitled'
+        url = article.get('url') or '#'
+        lines.append(f"- {title} ({url})")
+    return "Here are the latest crypto news articles:\n" + "\n".join(lines)
+
+
+def _summary_answer(query, route):
+    summaries = summarize_articles()
+    if not summaries:
+        return "No articles available to summarize."
+    return "Here are the summaries of the latest articles:\n" + "\n".join([f"- {summary.get('title', 'Untitled') or 'Untitled'}: {summary.get('summary', 'No summary available') or 'No summary available'}" for summary in summaries])
+
+
+def _graph_answer(query, route):
+    # Defaults to Bitcoin over the past year unless the query names a coin
+    ticker = f"{route.tickers[0]}-USD" if route.tickers else "BTC-USD"
+    days = 365
+    from modules.graph_viz import display_crypto_graph
+    display_crypto_graph(ticker, days)
+    return f"Displaying the graph for {ticker} over the past year."
+
+
+def _date_answer(query, route):
+    from datetime import datetime
+    current_date = datetime.now().strftime("%B %d, %Y")
+    return f"Today's date is {current_date}."
+
+
+QUERY_HANDLERS = {
+    router.SENTIMENT: lambda query, route: ask_sentiment_agent(query),
+    router.PRICE: _price_answer,
+    router.NEWS: _news_answer,
+    router.SUMMARY: _summary_answer,
+    router.GRAPH: _graph_answer,
+    router.DATE: _date_answer,
+}
+
+
+def _interpret_query(query: str) -> str:
+    print(f"Received query: {query}")  # Debugging output
+    route = router.classify(query)
+    # Compound queries go to their highest-priority intent
+    route.intent = route.intent or next(iter(route.intents), None)
+    print(f"Interpreting as a {route.intent} query.")  # Debugging output
+
+    # Handlers get the original text: short symbols like SOL only match in capitals
+    answer = router.dispatch(route, QUERY_HANDLERS, query)
+    if answer is None:
         return ("I'm sorry, I can't help with that request. "
                 "Please ask about cryptocurrency prices, news, sentiment, summarization, graph visualization, or the current date.")
+    return answer
 
 
 def main():
@@ -0,0 +1,260 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+from modules import dedup
+
+DB_PATH = os.path.join("data", "articles.db")
+LEGACY_JSON_PATH = os.path.join("data", "articles.json")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    published_at TEXT NOT NULL DEFAULT '',
+    title TEXT,
+    content TEXT,
+    source TEXT,
+    fetched_at TEXT NOT NULL,
+    UNIQUE (url, published_at)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source, published_at);
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    article_id INTEGER PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    bucket TEXT NOT NULL,
+    article_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON lsh_buckets (bucket);
+CREATE TABLE IF NOT EXISTS clusters (
+    id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = "a.title, a.content, a.url, a.published_at, a.source, c.size"
+_FROM = "articles a LEFT JOIN clusters c ON c.id = a.cluster_id"
+
+
+def _row_to_article(row):
+    title, content, url, published_at, source, cluster_size = row
+    return {
+        "title": title,
+        "content": content,
+        "url": url,
+        "published_at": published_at or None,
+        "source": source,
+        "cluster_size": cluster_size or 1,
+    }
+
+
+class ArticleStore:
+    """
+    Append-only, deduplicated article history backed by SQLite in WAL mode.
+
+    Articles are keyed on (url, published_at); re-inserting an article the
+    store already holds is a no-op, so each fetch only pays for new rows.
+
+    New articles are also clustered with near-duplicates (the same wire story
+    syndicated by several outlets) using MinHash signatures and an LSH bucket
+    index kept in the database. The first article of a cluster is its
+    representative; reads return only representatives by default, each
+    carrying its `cluster_size`.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._import_legacy_json()
+
+    def _migrate(self):
+        """Adds clustering to stores created before near-duplicate detection."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(articles)")]
+        if "cluster_id" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE articles ADD COLUMN cluster_id INTEGER")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_cluster ON articles (cluster_id)")
+        rows = self._conn.execute(
+            "SELECT id, title, content FROM articles WHERE cluster_id IS NULL ORDER BY id"
+        ).fetchall()
+        with self._conn:
+            for article_id, title, content in rows:
+                self._assign_cluster(article_id, {"title": title, "content": content})
+
+    def _assign_cluster(self, article_id, article) -> bool:
+        """
+        Files a stored article into the LSH index and its near-duplicate cluster.
+        Must run inside a transaction. Returns True if it starts a new cluster.
+        """
+        signature = dedup.minhash(dedup.dedup_text(article))
+        buckets = dedup.band_keys(signature)
+
+        placeholders = ",".join("?" * len(buckets))
+        candidates = self._conn.execute(
+            f"SELECT DISTINCT s.article_id, s.signature, a.cluster_id FROM lsh_buckets b "
+            f"JOIN signatures s ON s.article_id = b.article_id "
+            f"JOIN articles a ON a.id = b.article_id WHERE b.bucket IN ({placeholders})",
+            buckets,
+        ).fetchall()
+
+        best_cluster, best_score = None, dedup.SIMILARITY_THRESHOLD
+        for _, blob, cluster_id in candidates:
+            score = dedup.similarity(signature, np.frombuffer(blob, dtype=np.uint64))
+            if score >= best_score:
+                best_cluster, best_score = cluster_id, score
+
+        if best_cluster is None:
+            best_cluster = article_id
+            self._conn.execute("INSERT INTO clusters (id, size) VALUES (?, 1)", (article_id,))
+        else:
+            self._conn.execute("UPDATE clusters SET size = size + 1 WHERE id = ?", (best_cluster,))
+
+        self._conn.execute("UPDATE articles SET cluster_id = ? WHERE id = ?", (best_cluster, article_id))
+        self._conn.execute("INSERT INTO signatures (article_id, signature) VALUES (?, ?)",
+                           (article_id, signature.tobytes()))
+        self._conn.executemany("INSERT INTO lsh_buckets (bucket, article_id) VALUES (?, ?)",
+                               [(bucket, article_id) for bucket in buckets])
+        return best_cluster == article_id
+
+    def _import_legacy_json(self):
+        """Seed an empty store from the old rewrite-everything data/articles.json."""
+        if self.count() or not os.path.exists(LEGACY_JSON_PATH):
+            return
+        try:
+            with open(LEGACY_JSON_PATH, "r", encoding="utf-8") as f:
+                articles = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.add_articles(articles or [])
+
+    def add_articles(self, articles) -> list:
+        """
+        Inserts articles the store does not already hold and clusters them
+        with near-duplicates.
+
+        Returns:
+            list: Newly stored articles that start a new story cluster
+                  (syndicated copies of a known story are stored but not returned).
+        """
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        new_articles = []
+        with self._lock, self._conn:
+            for article in articles:
+                if not article or not article.get("url"):
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO articles "
+                    "(url, published_at, title, content, source, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        article["url"],
+                        article.get("published_at") or "",
+                        article.get("title"),
+                        article.get("content"),
+                        article.get("source"),
+                        fetched_at,
+                    ),
+                )
+                if cursor.rowcount and self._assign_cluster(cursor.lastrowid, article):
+                    new_articles.append(article)
+        return new_articles
+
+    def query(self, start=None, end=None, source=None, limit=None, unique=True) -> list:
+        """
+        Returns stored articles, newest first.
+
+        Args:
+            start (str): Inclusive lower bound on `published_at` (ISO 8601).
+            end (str): Exclusive upper bound on `published_at` (ISO 8601).
+            source (str): Only return articles from this source name.
+            limit (int): Maximum number of articles to return.
+            unique (bool): Only return one representative per near-duplicate cluster.
+        """
+        clauses, params = [], []
+        if start:
+            clauses.append("a.published_at >= ?")
+            params.append(start)
+        if end:
+            clauses.append("a.published_at < ?")
+            params.append(end)
+        if source:
+            clauses.append("a.source = ?")
+            params.append(source)
+        if unique:
+            clauses.append("a.id = a.cluster_id")
+
+        sql = f"SELECT {_COLUMNS} FROM {_FROM}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY a.published_at DESC, a.id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_row_to_article(row) for row in rows]
+
+    def added_since(self, version: int, unique: bool = True) -> list:
+        """Returns articles stored after the given corpus version, oldest first."""
+        sql = f"SELECT {_COLUMNS} FROM {_FROM} WHERE a.id > ?"
+        if unique:
+            sql += " AND a.id = a.cluster_id"
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY a.id", (version,)).fetchall()
+        return [_row_to_article(row) for row in rows]
+
+    def latest(self, limit: int = 100) -> list:
+        """Returns the most recently published articles."""
+        return self.query(limit=limit)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def version(self) -> int:
+        """Monotonic corpus version; only changes when new articles are stored."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+
+    def get_cursor(self, name: str):
+        """Returns the stored high-water mark for an ingestion source, if any."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, name: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO cursors (name, value) VALUES (?, ?)", (name, value))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: str = DB_PATH) -> ArticleStore:
+    """Returns the process-wide store for `path`, opening it on first use."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ArticleStore(path)
+        return _stores[path]
@@ -0,0 +1,79 @@
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Roughly the pixel width of the 12in x 100dpi price chart
+TARGET_POINTS = 1200
+FIGURE_CACHE_SIZE = 32
+
+
+def lttb(x, y, threshold: int = TARGET_POINTS) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most `threshold` points that preserve the
+    visual shape of the (x, y) series; the first and last points are kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_series(dates, values, threshold: int = TARGET_POINTS):
+    """Downsamples a date-indexed series to about `threshold` points for display."""
+    x = np.asarray(dates, dtype="datetime64[s]").astype(np.int64)
+    keep = lttb(x, values, threshold)
+    return [dates[i] for i in keep], np.asarray(values)[keep]
+
+
+class FigureCache:
+    """Small LRU of rendered chart PNGs keyed by (ticker, days, data version)."""
+
+    def __init__(self, max_entries: int = FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render) -> bytes:
+        """Returns the cached PNG for `key`, calling `render()` -> Figure on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        import matplotlib.pyplot as plt  # Deferred: only needed when a chart is actually drawn
+
+        fig = render()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+        plt.close(fig)
+        png = buffer.getvalue()
+
+        with self._lock:
+            self._entries[key] = png
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return png
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,58 @@
+import re
+import hashlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands x 4 rows: pairs above ~0.5 Jaccard almost always collide
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed so signatures stay comparable across processes and runs
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Word n-gram shingles of normalized text."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str) -> np.ndarray:
+    """NUM_PERM-long MinHash signature over the shingles of `text`."""
+    tokens = shingles(text)
+    if not tokens:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    hashes = np.array(
+        [int.from_bytes(hashlib.sha1(t.encode("utf-8")).digest()[:4], "little") for t in tokens],
+        dtype=np.uint64,
+    )
+    # Universal hashing (a*x + b) mod p, truncated to 32 bits, one row per permutation
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=1)
+
+
+def band_keys(signature: np.ndarray) -> list:
+    """One LSH bucket key per band; near-duplicates share at least one with high probability."""
+    rows = NUM_PERM // BANDS
+    return [
+        f"{band}:" + hashlib.sha1(signature[band * rows:(band + 1) * rows].tobytes()).hexdigest()[:16]
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def dedup_text(article) -> str:
+    """Text the signature is computed over: title plus description."""
+    return f"{article.get('title') or ''} {article.get('content') or ''}"
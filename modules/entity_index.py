@@ -0,0 +1,135 @@
+import os
+import json
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+
+from modules.tracing import trace
+
+# Shipped with the code rather than generated, so it is found from any working directory
+COINS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "coins.json")
+
+
+@dataclass
+class Mention:
+    """One coin mention: the matched text span and the symbol it refers to."""
+    symbol: str
+    start: int
+    end: int
+
+
+class EntityIndex:
+    """
+    Aho-Corasick automaton over every coin symbol, name and alias.
+
+    All mentions in a text are found in a single pass, however many coins
+    the table holds. Matches must sit on word boundaries, the longest match
+    wins ("bitcoin cash" over "bitcoin"), and symbols that are also everyday
+    words ("DOT", "LINK", "SOL") only count when written in capitals. Names
+    that are everyday words too ("Ripple", "Polygon") only count when
+    capitalized exactly as listed.
+    """
+
+    def __init__(self, coins):
+        self.symbols = set()
+        # Trie nodes: child transitions, failure link, (pattern length, symbol, exact spelling or None) outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for coin in coins:
+            symbol = coin["symbol"].upper()
+            self.symbols.add(symbol)
+            self._add(symbol, symbol, coin.get("case_sensitive", False))
+            for name in coin.get("names", []):
+                self._add(name, symbol, False)
+            for name in coin.get("case_sensitive_names", []):
+                self._add(name, symbol, True)
+        self._build()
+
+    def _add(self, pattern: str, symbol: str, case_sensitive: bool):
+        node = 0
+        for ch in pattern.lower():
+            if ch not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = len(self._goto) - 1
+            node = self._goto[node][ch]
+        self._out[node].append((len(pattern), symbol, pattern if case_sensitive else None))
+
+    def _build(self):
+        """Computes failure links breadth-first and merges each node's inherited outputs."""
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                pending.append(child)
+
+    def find(self, text: str) -> list:
+        """Returns every coin mention in the text, in order, without overlaps."""
+        lowered = text.lower()
+        candidates = []
+        node = 0
+        for end, ch in enumerate(lowered, 1):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, symbol, exact in self._out[node]:
+                start = end - length
+                if not _on_word_boundary(lowered, start, end):
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                candidates.append(Mention(symbol, start, end))
+
+        # Leftmost-longest: drop matches nested in or overlapping an earlier, longer one
+        mentions = []
+        for mention in sorted(candidates, key=lambda m: (m.start, m.start - m.end)):
+            if not mentions or mention.start >= mentions[-1].end:
+                mentions.append(mention)
+        return mentions
+
+    def tickers(self, text: str) -> list:
+        """Returns the symbols mentioned in the text, in order of first mention."""
+        return list(dict.fromkeys(mention.symbol for mention in self.find(text)))
+
+    def counts(self, text: str) -> Counter:
+        """Returns how often each symbol is mentioned in the text."""
+        return Counter(mention.symbol for mention in self.find(text))
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+
+def load_coins(path: str = COINS_PATH) -> list:
+    """Loads the coin table: a list of {"symbol", "names", "case_sensitive_names", "case_sensitive"} entries."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_entity_index() -> EntityIndex:
+    """Returns the process-wide coin index, compiled from data/coins.json on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            coins = load_coins()
+            _index = EntityIndex(coins)
+            trace("entity_index.build", coins=len(coins), nodes=len(_index._goto))
+        return _index
+
+
+def extract_tickers(text: str) -> list:
+    """Returns the coin symbols mentioned in a query or article, in order, without duplicates."""
+    return get_entity_index().tickers(text)
@@ -7,53 +7,127 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import json
 import logging
 import requests
-from config.settings import API_KEYS, NEWS_SOURCES
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import API_KEYS, NEWS_SETTINGS, NEWS_SOURCES
+from modules.article_store import get_store
+from modules.http_client import get_http_client
+from modules.json_stream import iter_records
+from modules.single_flight import single_flight
+from modules.tracing import span
 
 # Configure logging
+os.makedirs("logs", exist_ok=True)
 logging.basicConfig(filename="logs/app.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-def fetch_news():
-    url = f"{NEWS_SOURCES[0]}&apiKey={API_KEYS['newsapi']}"
+# Only these fields of each NewsAPI article are kept while parsing
+NEWS_FIELDS = ("title", "description", "url", "publishedAt", "source")
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
+def _to_article(a):
+    return {
+        "title": a.get("title", "No title"),
+        "content": a.get("description", "No content"),
+        "url": a.get("url", "#"),
+        "published_at": a.get("publishedAt", None),  # ✅ Include the article's published date
+        "source": (a.get("source") or {}).get("name")
+    }
 
-        # 🔍 Debug: Print API response
-        print("\n🔹 Full API Response:\n", json.dumps(data, indent=2))
+def fetch_source(source_url, cursor=None, until=None):
+    """
+    Walks the pages of one NewsAPI query, newest first, requesting only
+    articles published at or after `cursor` (the source's high-water mark)
+    and, with `until`, at or before it.
 
-        if "articles" not in data or not data["articles"]:
-            logging.warning("⚠️ API returned no articles.")
-            return []
+    Returns:
+        tuple: (articles, complete). `complete` is False when paging stopped
+        before the results ran out (max_pages or the plan's result cap), so
+        older articles in the window were not fetched.
+    """
+    page_size = NEWS_SETTINGS["page_size"]
+    articles = []
+    for page in range(1, NEWS_SETTINGS["max_pages"] + 1):
+        params = {"apiKey": API_KEYS['newsapi'], "sortBy": "publishedAt", "pageSize": page_size, "page": page}
+        if cursor:
+            params["from"] = cursor
+        if until:
+            params["to"] = until
+
+        response = get_http_client().get(source_url, params=params, stream=True)
+        if response.status_code != 200 and page > 1:
+            # e.g. the plan's result cap was reached; keep what we already have
+            logging.warning(f"⚠️ Stopped paging {source_url} at page {page}: {response.status_code}")
+            response.close()
+            return articles, False
+        if not response.ok:
+            response.close()
+            response.raise_for_status()
 
-        articles = [
-            {
-                "title": a.get("title", "No title"),
-                "content": a.get("description", "No content"),
-                "url": a.get("url", "#"),
-                "published_at": a.get("publishedAt", None)  # ✅ Include the article's published date
-            }
-            for a in data["articles"]
-        ]
+        # Parse articles incrementally; trace sizes and timings rather than the body
+        meta = {}
+        with span("newsapi.page", page=page) as fields:
+            batch = [_to_article(a) for a in iter_records(response, "articles.item", NEWS_FIELDS, meta, fields)]
+            fields["records"] = len(batch)
+        articles.extend(batch)
+        if len(batch) < page_size or page * page_size >= meta.get("totalResults", 0):
+            return articles, True
+    return articles, False
 
-        # Ensure `data/` folder exists
-        os.makedirs("data", exist_ok=True)
+def ingest_news():
+    """
+    Fetches every configured source concurrently, stores new articles and
+    advances each source's cursor.
 
-        # Save articles to JSON file
-        with open("data/articles.json", "w") as f:
-            json.dump(articles, f, indent=4)
+    The cursor only moves once every article since it has been fetched. When
+    paging stops early, the gap between the cursor and the oldest article
+    fetched is kept as a pending backfill and filled on the following runs.
 
-        print(f"✅ Successfully saved {len(articles)} articles to data/articles.json")
-        logging.info(f"✅ Successfully saved {len(articles)} articles.")
+    Returns:
+        list: Only the articles that were not stored before.
+    """
+    store = get_store()
 
-        return articles
+    def ingest(source_url):
+        cursor = store.get_cursor(source_url)
+        # {"high": newest article seen, "until": oldest fetched} while a gap remains
+        backfill_name = f"{source_url}#backfill"
+        backfill = json.loads(store.get_cursor(backfill_name) or "null")
+        try:
+            articles, complete = fetch_source(source_url, cursor, backfill["until"] if backfill else None)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"❌ Error fetching news: {e}")
+            print(f"❌ Error fetching news: {e}")
+            return []
+        if not articles:
+            logging.warning(f"⚠️ API returned no new articles for {source_url}.")
+            if complete and backfill:
+                store.set_cursor(source_url, backfill["high"])
+                store.set_cursor(backfill_name, "")
+            return []
 
-    except requests.exceptions.RequestException as e:
-        logging.error(f"❌ Error fetching news: {e}")
-        print(f"❌ Error fetching news: {e}")
-        return []
+        # Append only the articles we have not stored before
+        new_articles = store.add_articles(articles)
+        published = [a["published_at"] for a in articles if a["published_at"]]
+        if published:
+            high = max([backfill["high"]] + published) if backfill else max(published)
+            if complete:
+                store.set_cursor(source_url, high)
+                store.set_cursor(backfill_name, "")
+            else:
+                logging.warning(f"⚠️ {source_url}: backfilling articles older than {min(published)} next run")
+                store.set_cursor(backfill_name, json.dumps({"high": high, "until": min(published)}))
+        return new_articles
+
+    with ThreadPoolExecutor(max_workers=len(NEWS_SOURCES)) as pool:
+        new_articles = [a for batch in pool.map(ingest, NEWS_SOURCES) for a in batch]
+
+    print(f"✅ Successfully saved {len(new_articles)} new articles to the article store")
+    logging.info(f"✅ Successfully saved {len(new_articles)} new articles.")
+    return new_articles
+
+@single_flight(copy=list)
+def fetch_news():
+    """Ingests new articles and returns the latest stored ones."""
+    ingest_news()
+    return get_store().latest(NEWS_SETTINGS["latest_limit"])
 
 if __name__ == "__main__":
     fetch_news()
@@ -2,10 +2,13 @@ import requests
 import os
 import json
 from dotenv import load_dotenv
+from modules.http_client import get_http_client
+from modules.single_flight import single_flight
 
 # Load environment variables
 load_dotenv()
 
+@single_flight(copy=list)
 def fetch_regulations_gov_news(api_key, query="crypto", page_size=10):
     """
     Fetch cryptocurrency-related regulatory news from Regulations.gov API.
@@ -27,7 +30,7 @@ def fetch_regulations_gov_news(api_key, query="crypto", page_size=10):
     }
     
     try:
-        response = requests.get(base_url, params=params)
+        response = get_http_client().get(base_url, params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -1,16 +1,23 @@
 import os
+import hashlib
 import requests
+import numpy as np
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
 from modules.gov_news_agent import fetch_regulations_gov_news  # ✅ Updated source
 from modules.fetch_news import fetch_news
 from modules.sentiment import analyze_sentiment
+from modules.price_cache import FIELDS, PriceDataError, get_candle_cache
+from modules.chart_render import downsample_series, figure_cache
+from modules.single_flight import single_flight
 
 load_dotenv()
 
+# Sessions rendering the same chart share one fetch; each gets its own copy
+# because display_crypto_graph rewrites df.index in place
+@single_flight(copy=pd.DataFrame.copy)
 def fetch_crypto_price_data(
     ticker: str = "BTC-USD",
     days: int = 365,
@@ -25,52 +32,57 @@ def fetch_crypto_price_data(
         st.error("API key not found. Please set your FINANCIAL_DATASETS_API_KEY in the environment.")
         return pd.DataFrame()
 
-    end_date = datetime.today().strftime('%Y-%m-%d')
-    start_date = (datetime.today() - timedelta(days=days)).strftime('%Y-%m-%d')
+    end_date = datetime.today().date()
+    start_date = end_date - timedelta(days=days)
 
-    params = {
-        "ticker": ticker,
-        "interval": interval,
-        "interval_multiplier": interval_multiplier,
-        "start_date": start_date,
-        "end_date": end_date,
-        "limit": 5000
-    }
-
-    headers = {"X-API-KEY": api_key}
-
-    response = requests.get("https://api.financialdatasets.ai/crypto/prices/",
-                            headers=headers, params=params)
-
-    if response.status_code != 200:
-        st.error(f"Failed to fetch data: {response.status_code}")
+    # Only the missing edges of the cached series are downloaded
+    try:
+        candles = get_candle_cache().get(ticker, start_date, end_date, interval, interval_multiplier)
+    except PriceDataError as e:
+        st.error(f"Failed to fetch data: {e.status_code}")
+        return pd.DataFrame()
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch data: {e}")
         return pd.DataFrame()
 
-    data = response.json()
-    prices = data.get('prices', {}).get('prices', [])
-
-    if not prices:
+    if not len(candles["time"]):
         st.warning("No price data found.")
         return pd.DataFrame()
 
-    df = pd.DataFrame(prices)
-    if 'time' in df.columns:
-        df.rename(columns={'time': 'timestamp'}, inplace=True)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
-
+    df = pd.DataFrame({field: candles[field] for field in FIELDS},
+                      index=pd.to_datetime(candles["time"], unit="s"))
+    df.index.name = "timestamp"
     return df
 
-def fetch_article_data(price_dates: list) -> pd.DataFrame:
+# Above this many events, dots are drawn without per-dot number labels
+MAX_ANNOTATIONS = 50
+
+def align_to_nearest(dates, price_dates) -> np.ndarray:
     """
-    Fetches recent cryptocurrency-related regulatory articles from Regulations.gov
-    and aligns their timestamps with the closest available price date.
+    Returns, for each date, the position of the closest date in the sorted
+    `price_dates` (ties go to the earlier bar), via binary search.
     """
-    API_KEY = os.getenv("REGULATIONS_GOV_API_KEY")
-    if not API_KEY:
-        return pd.DataFrame()
+    price = np.asarray(price_dates, dtype="datetime64[D]")
+    target = np.asarray(dates, dtype="datetime64[D]")
+    if len(price) < 2:
+        return np.zeros(len(target), dtype=np.int64)
 
-    articles = fetch_regulations_gov_news(API_KEY)
+    right = np.searchsorted(price, target).clip(1, len(price) - 1)
+    left = right - 1
+    use_left = (target - price[left]) <= (price[right] - target)
+    return np.where(use_left, left, right)
+
+def fetch_article_data(price_dates: list, articles: list = None) -> pd.DataFrame:
+    """
+    Fetches recent cryptocurrency-related regulatory articles from Regulations.gov
+    (unless `articles` are given) and aligns their timestamps with the closest
+    available price date.
+    """
+    if articles is None:
+        API_KEY = os.getenv("REGULATIONS_GOV_API_KEY")
+        if not API_KEY:
+            return pd.DataFrame()
+        articles = fetch_regulations_gov_news(API_KEY)
 
     if not articles:
         return pd.DataFrame()
@@ -83,20 +95,92 @@ def fetch_article_data(price_dates: list) -> pd.DataFrame:
         df_news['posted_date'] = df_news['posted_date'].dt.date
 
         # Snap article timestamps to closest available price date
-        df_news['closest_price_date'] = df_news['posted_date'].apply(
-            lambda x: min(price_dates, key=lambda d: abs(d - x))
-        )
+        df_news['price_index'] = align_to_nearest(df_news['posted_date'].tolist(), price_dates)
+        df_news['closest_price_date'] = [price_dates[i] for i in df_news['price_index']]
 
         df_news.set_index('closest_price_date', inplace=True)
 
     return df_news
 
-def display_crypto_graph(ticker: str, days: int = 365):
+def render_price_figure(ticker: str, df: pd.DataFrame, df_news: pd.DataFrame):
+    """
+    Draws the price line (LTTB-downsampled to about the chart's pixel width)
+    with article events overlaid as numbered dots, and returns the figure.
+    """
+    import matplotlib.pyplot as plt  # Deferred: cache hits and interactive charts never need it
+
+    dates, closes = downsample_series(df.index.tolist(), df['close'].to_numpy())
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(dates, closes, label="Closing Price", color="blue")
+
+    # Overlay article events as dots in a single scatter call (with numbering)
+    if not df_news.empty:
+        event_dates = df_news.index.tolist()
+        event_prices = df['close'].to_numpy()[df_news['price_index'].to_numpy()]
+        ax.scatter(event_dates, event_prices, color="red", s=100)  # Larger dots for visibility
+
+        if len(event_dates) <= MAX_ANNOTATIONS:
+            for i, (date, price) in enumerate(zip(event_dates, event_prices), start=1):
+                ax.annotate(str(i), (date, price), textcoords="offset points",
+                            xytext=(0,10), ha='center', fontsize=10, color="white",
+                            bbox=dict(facecolor="red", alpha=0.5, edgecolor="none", boxstyle="circle"))
+
+    ax.set_title(f"{ticker} Price Chart with News Events")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price (USD)")
+    ax.legend()
+    ax.grid()
+    return fig
+
+def render_interactive_chart(df: pd.DataFrame, df_news: pd.DataFrame):
+    """Ships the downsampled series and event points to the browser as a Vega-Lite chart."""
+    dates, closes = downsample_series(df.index.tolist(), df['close'].to_numpy())
+    line = pd.DataFrame({"date": pd.to_datetime(dates), "close": closes, "title": None})
+    layers = [line.assign(kind="price")]
+    if not df_news.empty:
+        events = pd.DataFrame({
+            "date": pd.to_datetime(df_news.index.tolist()),
+            "close": df['close'].to_numpy()[df_news['price_index'].to_numpy()],
+            "title": df_news['title'].to_numpy(),
+        })
+        layers.append(events.assign(kind="event"))
+
+    st.vega_lite_chart(pd.concat(layers, ignore_index=True), {
+        "layer": [
+            {"mark": {"type": "line", "color": "blue"},
+             "transform": [{"filter": "datum.kind == 'price'"}],
+             "encoding": {"x": {"field": "date", "type": "temporal", "title": "Date"},
+                          "y": {"field": "close", "type": "quantitative", "title": "Price (USD)"}}},
+            {"mark": {"type": "point", "color": "red", "filled": True, "size": 100},
+             "transform": [{"filter": "datum.kind == 'event'"}],
+             "encoding": {"x": {"field": "date", "type": "temporal"},
+                          "y": {"field": "close", "type": "quantitative"},
+                          "tooltip": [{"field": "date", "type": "temporal"}, {"field": "title"}]}},
+        ],
+    }, use_container_width=True)
+
+def _events_digest(df_news) -> str:
+    """Digest of the events' bar positions and titles, so the cached chart's dots match the list."""
+    if df_news.empty:
+        return ""
+    positions = df_news['price_index'] if 'price_index' in df_news.columns else df_news.index
+    titles = df_news['title'] if 'title' in df_news.columns else [""] * len(df_news)
+    payload = "\n".join(f"{position}|{title}" for position, title in zip(positions, titles))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def display_crypto_graph(ticker: str, days: int = 365, interactive: bool = False,
+                         prices: pd.DataFrame = None, events: list = None):
     """
     Fetches crypto price data and overlays article events as dots.
     Numbered annotations will indicate which article corresponds to each dot.
+
+    The static chart is rendered once per (ticker, days, data version) and
+    served from a PNG cache; `interactive` draws it client-side instead.
+    Precomputed `prices` and `events` (e.g. from the dashboard snapshot)
+    skip the upstream fetches.
     """
-    df = fetch_crypto_price_data(ticker=ticker, days=days)
+    df = prices.copy() if prices is not None else fetch_crypto_price_data(ticker=ticker, days=days)
 
     if df.empty:
         st.warning("No price data available to display.")
@@ -109,33 +193,22 @@ def display_crypto_graph(ticker: str, days: int = 365):
     price_dates = df.index.tolist()  
 
     # Fetch news and align with closest price dates
-    df_news = fetch_article_data(price_dates)
+    df_news = fetch_article_data(price_dates, events)
+
+    if interactive:
+        render_interactive_chart(df, df_news)
+    else:
+        # New bars, a moved last close or a different set of events all change the version
+        version = (len(df), price_dates[-1], float(df['close'].iloc[-1]), _events_digest(df_news))
+        png = figure_cache.get_or_render((ticker, days, version),
+                                         lambda: render_price_figure(ticker, df, df_news))
+        st.image(png, use_container_width=True)
 
     # Prepare article info for display
     article_list = []
-
-    # Plot price data
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(df.index, df['close'], label="Closing Price", color="blue")
-
-    # Overlay article events as dots only (with numbering)
     if not df_news.empty:
-        for i, (date, row) in enumerate(df_news.iterrows(), start=1):
-            ax.scatter(date, df.loc[date, "close"], color="red", s=100)  # Larger dots for visibility
-            ax.annotate(str(i), (date, df.loc[date, "close"]), textcoords="offset points",
-                        xytext=(0,10), ha='center', fontsize=10, color="white",
-                        bbox=dict(facecolor="red", alpha=0.5, edgecolor="none", boxstyle="circle"))
-
-            article_list.append(f"🔴 **{i}. {date}: {row['title']}**")
-
-    ax.set_title(f"{ticker} Price Chart with News Events")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Price (USD)")
-    ax.legend()
-    ax.grid()
-
-    # Display the plot in Streamlit
-    st.pyplot(fig)
+        article_list = [f"🔴 **{i}. {date}: {title}**"
+                        for i, (date, title) in enumerate(zip(df_news.index, df_news['title']), start=1)]
 
     # Display the article list with matching numbers
     if article_list:
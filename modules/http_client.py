@@ -0,0 +1,165 @@
+import sys
+import os
+
+# Ensure Python finds the `config` module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+import random
+import logging
+import weakref
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import HTTP_SETTINGS
+from modules.tracing import trace
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+
+class HttpClient:
+    """
+    Shared HTTP layer for every upstream API.
+
+    Keeps one pooled keep-alive session, applies default timeouts, retries
+    429/5xx responses and connection errors with exponential backoff and
+    full jitter, caps concurrent requests per host, and records per-endpoint
+    latency histograms.
+
+    The per-host cap covers the whole transfer: a `stream=True` response
+    keeps its slot until it is closed (or garbage collected), so callers
+    reading the body incrementally must close it when done.
+    """
+
+    def __init__(self, settings: dict = None):
+        settings = {**HTTP_SETTINGS, **(settings or {})}
+        self.timeout = (settings["connect_timeout"], settings["read_timeout"])
+        self.max_retries = settings["max_retries"]
+        self.backoff_base = settings["backoff_base"]
+        self.backoff_max = settings["backoff_max"]
+        self.max_per_host = settings["max_connections_per_host"]
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.max_per_host)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._host_slots = {}
+        self._latency = {}
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def _record(self, endpoint, elapsed_ms):
+        with self._lock:
+            stats = self._latency.setdefault(
+                endpoint, {"count": 0, "total_ms": 0.0, "buckets": [0] * len(LATENCY_BUCKETS_MS)}
+            )
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            for i, upper in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= upper:
+                    stats["buckets"][i] += 1
+                    break
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = random.uniform(0, self.backoff_base * (2 ** attempt))
+        time.sleep(min(delay, self.backoff_max))
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False) -> requests.Response:
+        """
+        Sends a GET request through the shared session.
+
+        Returns the final response (which may still be an error status once
+        retries are exhausted). Connection errors and timeouts raise
+        `requests.exceptions.RequestException` after the last retry.
+        """
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+        slot = self._slot(parts.netloc)
+
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            slot.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=headers,
+                                            timeout=timeout or self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                slot.release()
+                self._record(endpoint, (time.perf_counter() - start) * 1000)
+                if attempt == self.max_retries:
+                    raise
+                logging.warning(f"⚠️ {endpoint} failed ({e}); retrying")
+                self._backoff(attempt)
+                continue
+
+            except BaseException:
+                slot.release()
+                raise
+            if stream:
+                _hold_slot(response, slot)
+            else:
+                slot.release()
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._record(endpoint, elapsed_ms)
+            trace("http.get", endpoint=endpoint, status=response.status_code, attempt=attempt,
+                  elapsed_ms=f"{elapsed_ms:.1f}")
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                logging.warning(f"⚠️ {endpoint} returned {response.status_code}; retrying")
+                response.close()
+                self._backoff(attempt, response)
+                continue
+            return response
+
+    def latency_stats(self) -> dict:
+        """Returns a copy of the per-endpoint latency histograms."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": stats["count"],
+                    "mean_ms": stats["total_ms"] / stats["count"],
+                    "buckets": dict(zip(LATENCY_BUCKETS_MS, stats["buckets"])),
+                }
+                for endpoint, stats in self._latency.items()
+            }
+
+
+def _hold_slot(response, slot):
+    """Releases the host slot once the streamed response is closed, or collected unclosed."""
+    release = weakref.finalize(response, slot.release)  # Runs at most once
+    close = response.close
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            release()
+
+    response.close = close_and_release
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Returns the process-wide HTTP client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,85 @@
+try:
+    import ijson  # Optional: enables incremental parsing of large payloads
+except ImportError:
+    ijson = None
+
+_SCALAR_EVENTS = {"string", "number", "boolean", "null"}
+
+
+class CountingReader:
+    """File-like wrapper that counts the bytes read from an HTTP response body."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = self.raw.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _project(item, fields):
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {field: item.get(field) for field in fields if field in item}
+
+
+def _walk(data, path):
+    """Fallback for a fully parsed document: yields items at an ijson-style prefix."""
+    parts = path.split(".")
+    nodes = [data]
+    for part in parts:
+        if part == "item":
+            nodes = [item for node in nodes if isinstance(node, list) for item in node]
+        else:
+            nodes = [node.get(part) for node in nodes if isinstance(node, dict) and node.get(part) is not None]
+    return nodes
+
+
+def iter_records(response, prefix: str, fields=None, meta: dict = None, stats: dict = None):
+    """
+    Yields the items at `prefix` (ijson syntax, e.g. "articles.item") from a
+    response opened with stream=True, keeping only `fields` of each record.
+
+    Top-level scalars (e.g. NewsAPI's totalResults) are collected into `meta`,
+    and the number of body bytes read into `stats["bytes"]`. Without ijson
+    installed the body is parsed in one go with the same results. The
+    response is closed once the records are exhausted or abandoned.
+    """
+    meta = meta if meta is not None else {}
+    stats = stats if stats is not None else {}
+
+    if ijson is None:
+        try:
+            body = response.content
+        finally:
+            response.close()
+        stats["bytes"] = len(body)
+        data = response.json()
+        if isinstance(data, dict):
+            meta.update({k: v for k, v in data.items() if not isinstance(v, (dict, list))})
+        for item in _walk(data, prefix):
+            yield _project(item, fields)
+        return
+
+    response.raw.decode_content = True
+    reader = CountingReader(response.raw)
+    parser = ijson.parse(reader, use_float=True)
+    try:
+        for current, event, value in parser:
+            if current == prefix:
+                if event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    end_event = event.replace("start", "end")
+                    while (current, event) != (prefix, end_event):
+                        builder.event(event, value)
+                        current, event, value = next(parser)
+                    yield _project(builder.value, fields)
+                else:
+                    yield value
+            elif event in _SCALAR_EVENTS and current and "." not in current:
+                meta[current] = value
+    finally:
+        stats["bytes"] = reader.bytes_read
+        response.close()
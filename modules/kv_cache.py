@@ -0,0 +1,104 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_BATCH = 500
+
+
+class PersistentCache:
+    """
+    Small persistent key -> JSON value cache on SQLite (WAL), safe to share
+    between threads and processes.
+
+    `max_entries` bounds the cache with least-recently-used eviction and
+    `ttl` (seconds since the entry was written) expires stale entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = None, ttl: float = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get_many(self, keys) -> dict:
+        """Returns {key: value} for every key present and not expired."""
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        with self._lock, self._conn:
+            for i in range(0, len(keys), _BATCH):
+                batch = keys[i:i + _BATCH]
+                placeholders = ",".join("?" * len(batch))
+                sql = f"SELECT key, value, created_at FROM entries WHERE key IN ({placeholders})"
+                for key, value, created_at in self._conn.execute(sql, batch):
+                    if self.ttl is None or now - created_at <= self.ttl:
+                        found[key] = json.loads(value)
+            hits = list(found)
+            for i in range(0, len(hits), _BATCH):
+                batch = hits[i:i + _BATCH]
+                placeholders = ",".join("?" * len(batch))
+                self._conn.execute(f"UPDATE entries SET last_used = ? WHERE key IN ({placeholders})",
+                                   [now] + batch)
+        return found
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def set_many(self, items: dict):
+        """Stores every key -> value pair, then evicts down to `max_entries`."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(value), now, now) for key, value in items.items()]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows)
+            if self.ttl is not None:
+                self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl,))
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def items(self) -> list:
+        """Returns every unexpired (key, value) pair, without refreshing recency."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value, created_at FROM entries").fetchall()
+        return [
+            (key, json.loads(value)) for key, value, created_at in rows
+            if self.ttl is None or now - created_at <= self.ttl
+        ]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
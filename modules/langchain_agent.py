@@ -1,21 +1,22 @@
 import os
-import json
+import threading
 
-from langchain_community.chat_models import ChatOpenAI
-from langchain_community.llms import OpenAI
-from langchain_community.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain.chains import RetrievalQA
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from modules.agent_registry import get_agent
+from modules.article_store import get_store
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-def load_articles():
-    """Load articles from JSON and return as list of strings."""
+# Process-wide FAISS index, grown in place as new articles are stored
+_vector_store = None
+_indexed_version = 0
+_indexed_chunks = set()
+_vector_store_lock = threading.Lock()
+
+def load_articles(since_version: int = 0):
+    """Load articles from the article store and return as list of strings."""
     try:
-        with open("data/articles.json", "r", encoding="utf-8") as f:
-            articles = json.load(f)
+        articles = get_store().added_since(since_version)
         if not articles:
             return []
         docs = []
@@ -28,24 +29,48 @@ def load_articles():
         return []
 
 def create_vector_store():
-    """Convert articles into embeddings for retrieval."""
-    articles = load_articles()
-    if not articles:
-        return None
+    """
+    Return the process-wide vector store, embedding only chunks of articles
+    stored since the last call. Vectors for chunks seen in earlier processes
+    come from the on-disk index instead of the embedding API.
+    """
+    from langchain_community.vectorstores import FAISS
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from modules.vector_index import content_hash, get_vector_index
+
+    global _vector_store, _indexed_version
+    with _vector_store_lock:
+        version = get_store().version()
+        if version == _indexed_version:
+            return _vector_store
 
-    embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    docs = text_splitter.create_documents(articles)
+        articles = load_articles(_indexed_version)
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+        chunks = [doc.page_content for doc in text_splitter.create_documents(articles)]
+        new_chunks = list(dict.fromkeys(c for c in chunks if content_hash(c) not in _indexed_chunks))
 
-    vector_store = FAISS.from_documents(docs, embeddings)
-    return vector_store
+        if new_chunks:
+            index = get_vector_index()
+            text_embeddings = list(zip(new_chunks, index.embed(new_chunks).tolist()))
+            if _vector_store is None:
+                _vector_store = FAISS.from_embeddings(text_embeddings, index.embeddings)
+            else:
+                _vector_store.add_embeddings(text_embeddings)
+            _indexed_chunks.update(content_hash(c) for c in new_chunks)
+
+        _indexed_version = version
+        return _vector_store
 
 def create_chatbot():
     """Create an OpenAI-powered chatbot with retrieval capabilities."""
+    from langchain_community.chat_models import ChatOpenAI
+    from langchain.chains import RetrievalQA
+
     vector_store = create_vector_store()
     llm = ChatOpenAI(
         model_name="gpt-4",
-        openai_api_key=OPENAI_API_KEY
+        openai_api_key=OPENAI_API_KEY,
+        streaming=True  # Tokens reach callbacks as they are generated (see stream_question)
     )
 
     if vector_store:
@@ -61,11 +86,43 @@ def create_chatbot():
         return llm
 
 def ask_question(query: str) -> str:
-    """Ask a question to the chatbot. Returns a string response."""
-    chatbot = create_chatbot()
+    """
+    Ask a question to the chatbot. Returns a string response; repeated
+    questions are answered from the response cache until new articles arrive.
+    """
+    from modules.response_cache import get_response_cache
+    return get_response_cache().answer("chatbot", query, lambda: _ask_question(query))
+
+def _ask_question(query: str) -> str:
+    from langchain_community.chat_models import ChatOpenAI
+
+    # Rebuilt only when new articles have been stored
+    chatbot = get_agent("chatbot", create_chatbot, version=get_store().version())
     if isinstance(chatbot, ChatOpenAI):
         # fallback: just LLM with no retrieval
         return chatbot.predict(query)
     else:
         # run the retrieval QA chain
         return chatbot.run(query)
+
+def stream_question(query: str):
+    """Streams the chatbot's answer as StreamEvents (see modules/streaming.py)."""
+    from modules.response_cache import get_response_cache
+    from modules.streaming import chat_backend
+
+    scope = "chatbot" if chat_backend() != "fake" else "chatbot-fake"
+    return get_response_cache().stream(scope, query, lambda: _stream_question(query))
+
+def _stream_question(query: str):
+    from modules.streaming import FakeStreamingLLM, chat_backend, stream_langchain
+
+    if chat_backend() == "fake":
+        fake = FakeStreamingLLM()
+        return stream_langchain(lambda callbacks: fake.run(query, callbacks=callbacks))
+
+    from langchain_community.chat_models import ChatOpenAI
+
+    chatbot = get_agent("chatbot", create_chatbot, version=get_store().version())
+    if isinstance(chatbot, ChatOpenAI):
+        return stream_langchain(lambda callbacks: chatbot.predict(query, callbacks=callbacks))
+    return stream_langchain(lambda callbacks: chatbot.run(query, callbacks=callbacks))
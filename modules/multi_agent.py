@@ -1,43 +1,49 @@
 import os
-import re
-from langchain.agents import initialize_agent, Tool
-from langchain_community.llms import OpenAI
-
-from modules.langchain_agent import ask_question  # Local news agent
-from modules.price_agent import PriceAgent  # Crypto price agent
-from modules.fetch_news import fetch_news  # News Fetcher
-from modules.sentiment import analyze_sentiment  # Sentiment Analysis
+from datetime import date, timedelta
+
+from modules.agent_registry import get_agent
+from modules.entity_index import extract_tickers
+from modules import planner
+from modules.price_agent import format_quotes
+from modules.request_context import request_context, get_news, get_quotes  # Fetch-once news & prices
+from modules.response_cache import skip_caching
+from modules.sentiment import analyze_sentiment, format_sentiment, sentiment_by_coin  # Sentiment Analysis
+from modules import router
+from modules.tracing import trace
 
 # ✅ Load environment variables
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 
+# Multi-agent answers quote live prices, so cached ones expire sooner than chatbot answers
+RESPONSE_TTL = float(os.getenv("MULTI_AGENT_CACHE_TTL", "300"))
+
 # ✅ Web Search Toggle (Disables if no API Key)
 WEB_SEARCH_ENABLED = bool(SERPAPI_API_KEY)
-if WEB_SEARCH_ENABLED:
-    from modules.web_search_agent import ask_web_search_agent
-else:
-    ask_web_search_agent = None  # Prevents function call errors
 
-# ✅ Initialize Price Agent
-price_agent = PriceAgent()
+def quote_answer(tickers) -> str:
+    """Quotes every ticker; answers containing an upstream error are kept out of the response cache."""
+    quotes = get_quotes(tickers)
+    failed = [ticker for ticker, quote in quotes.items() if not quote.ok]
+    if failed:
+        skip_caching(f"quote failed for {', '.join(failed)}")
+    return format_quotes(quotes)
 
 def ask_price_agent(query: str) -> str:
-    """Fetches cryptocurrency prices if the query contains a coin symbol."""
-    print(f"🔍 DEBUG: Received query = {query}")  
+    """Fetches cryptocurrency prices for every coin symbol in the query."""
+    trace("price_agent.query", query_chars=len(query))
 
-    matches = re.findall(r"\b[A-Z]{2,5}\b", query.upper())  
+    tickers = extract_tickers(query)
 
-    if matches:
-        coin_symbol = matches[0]  
-        print(f"✅ DEBUG: Detected crypto symbol = {coin_symbol}")  
-        return price_agent.get_crypto_price(coin_symbol)
+    if tickers:
+        trace("price_agent.symbols", symbols=",".join(tickers))
+        return quote_answer(tickers)
 
     return "I couldn't detect a cryptocurrency symbol. Please specify a coin like BTC, ETH, or SOL."
 
 def ask_news_agent(query: str) -> str:
     """Fetches news articles from the news API and summarizes relevant results."""
-    articles = fetch_news()
+    articles = get_news()
     if not articles:
         return "No recent cryptocurrency news available."
     
@@ -46,16 +52,77 @@ def ask_news_agent(query: str) -> str:
 
 def ask_sentiment_agent(query: str) -> str:
     """Analyzes sentiment from the latest fetched crypto news articles."""
-    articles = fetch_news()
+    articles = get_news()
     if not articles:
         return "No news available to analyze sentiment."
 
+    tickers = extract_tickers(query)
+    if tickers:
+        # Only the articles that mention the coins asked about
+        by_coin = sentiment_by_coin(articles, tickers)
+        return "\n\n".join(f"Sentiment Analysis Result for {ticker}: {format_sentiment(batch)}"
+                             for ticker, batch in by_coin.items())
+
     sentiment_result = analyze_sentiment(" ".join([article.get('content', '') for article in articles]))
     return f"Sentiment Analysis Result: {sentiment_result}"
 
+def ask_summary_agent(query: str) -> str:
+    """Summarizes the latest crypto news articles."""
+    from modules.summarizer import summarize_articles
+
+    summaries = summarize_articles(get_news())
+    if not summaries:
+        return "No articles available to summarize."
+    return "\n".join(f"- {summary.get('title') or 'Untitled'}: {summary.get('summary') or 'No summary available'}"
+                     for summary in summaries)
+
+def ask_price_trend(tickers, days: int = 30) -> str:
+    """Describes each coin's price move over the last `days` days from the candle cache."""
+    from modules.price_cache import get_candle_cache
+
+    lines = []
+    for ticker in tickers:
+        closes = get_candle_cache().get(f"{ticker}-USD", date.today() - timedelta(days=days), date.today())["close"]
+        if len(closes) < 2:
+            lines.append(f"{ticker}: not enough price history.")
+            continue
+        change = (closes[-1] / closes[0] - 1) * 100
+        lines.append(f"{ticker}: {change:+.1f}% over {days} days (low ${closes.min():,.2f}, "
+                     f"high ${closes.max():,.2f}, last ${closes[-1]:,.2f}); see the Graph tab for the chart.")
+    return "\n".join(lines)
+
+# Confident single-intent queries skip the ReAct loop: intent -> (tool name, handler)
+FAST_PATH = {
+    router.PRICE: ("Crypto Price Fetcher", lambda query, route: quote_answer(route.tickers or ["BTC"])),
+    router.NEWS: ("Local News Retrieval", lambda query, route: ask_news_agent(query)),
+    router.SENTIMENT: ("Crypto Sentiment Analysis", lambda query, route: ask_sentiment_agent(query)),
+}
+_FAST_PATH_HANDLERS = {intent: handler for intent, (_, handler) in FAST_PATH.items()}
+
+# Compound queries run one tool per intent concurrently, then one synthesis LLM call
+PLAN_TOOLS = {
+    **FAST_PATH,
+    router.SUMMARY: ("Article Summaries", lambda query, route: ask_summary_agent(query)),
+    router.GRAPH: ("Price Trend", lambda query, route: ask_price_trend(route.tickers or ["BTC"])),
+}
+
+def _plan(query: str, route):
+    """Returns the planner's tool calls for a compound query, or None if it is not one."""
+    if not route.compound or not any(intent in PLAN_TOOLS for intent in route.intents):
+        return None
+    extra = {}
+    if WEB_SEARCH_ENABLED:
+        from modules.web_search_agent import ask_web_search_agent
+        extra["Real-Time Web Search"] = lambda query, route: ask_web_search_agent(query)
+    return planner.plan(query, route, PLAN_TOOLS, extra)
+
 def create_multi_agent():
     """Creates the multi-agent system with available tools."""
-    llm = OpenAI(openai_api_key=OPENAI_API_KEY, temperature=0)
+    # LangChain is only imported once an agent is actually built
+    from langchain.agents import initialize_agent, Tool
+    from langchain_community.llms import OpenAI
+
+    llm = OpenAI(openai_api_key=OPENAI_API_KEY, temperature=0, streaming=True)
 
     tools = [
         Tool(
@@ -77,6 +144,7 @@ def create_multi_agent():
 
     # ✅ **Only add Web Search if SerpAPI key exists**
     if WEB_SEARCH_ENABLED:
+        from modules.web_search_agent import ask_web_search_agent
         tools.append(
             Tool(
                 name="Real-Time Web Search",
@@ -96,9 +164,66 @@ def create_multi_agent():
     return agent
 
 def ask_multi_agent(query: str) -> str:
-    """Runs the multi-agent system for a given query."""
-    agent = create_multi_agent()
-    return agent.run(query)
+    """Runs the multi-agent system for a given query, reusing recent answers to the same question."""
+    from modules.response_cache import get_response_cache
+    return get_response_cache().answer("multi_agent", query, lambda: _ask_multi_agent(query), ttl=RESPONSE_TTL)
+
+def _ask_multi_agent(query: str) -> str:
+    route = router.classify(query)
+    with request_context():
+        answer = router.dispatch(route, _FAST_PATH_HANDLERS, query)
+        if answer is not None:
+            return answer
+        calls = _plan(query, route)
+        if calls:
+            return planner.run_plan(query, calls)
+        # Ambiguous: let the LLM agent decide which tools to call
+        return get_agent("multi_agent", create_multi_agent).run(query)
+
+def stream_multi_agent(query: str):
+    """
+    Streams the multi-agent's run as StreamEvents: a tool event per tool call,
+    then the tokens of its final answer (see modules/streaming.py).
+    """
+    from modules.response_cache import get_response_cache
+    from modules.streaming import chat_backend
+
+    scope = "multi_agent" if chat_backend() != "fake" else "multi_agent-fake"
+    return get_response_cache().stream(scope, query, lambda: _stream_multi_agent(query), ttl=RESPONSE_TTL)
+
+def _stream_multi_agent(query: str):
+    from modules.streaming import FINAL_ANSWER_PREFIX, FakeStreamingLLM, chat_backend, stream_langchain
+
+    route = router.classify(query)
+    if route.intent in FAST_PATH:
+        return _stream_fast_path(query, route)
+    calls = _plan(query, route)
+    if calls:
+        return _stream_planned(query, calls)
+
+    if chat_backend() == "fake":
+        agent = FakeStreamingLLM(tools=["Local News Retrieval"],
+                                 preamble=f"Thought: I now know the final answer\n{FINAL_ANSWER_PREFIX}")
+    else:
+        agent = get_agent("multi_agent", create_multi_agent)
+
+    def run(callbacks):
+        with request_context():
+            return agent.run(query, callbacks=callbacks)
+
+    return stream_langchain(run, final_answer_prefix=FINAL_ANSWER_PREFIX)
+
+def _stream_fast_path(query: str, route):
+    from modules.streaming import TOKEN, TOOL_START, StreamEvent
+
+    yield StreamEvent(TOOL_START, FAST_PATH[route.intent][0])
+    with request_context():
+        yield StreamEvent(TOKEN, router.dispatch(route, _FAST_PATH_HANDLERS, query))
+
+def _stream_planned(query: str, calls):
+    # One request context, so concurrent tools share a single news fetch
+    with request_context():
+        yield from planner.stream_plan(query, calls)
 
 if __name__ == "__main__":
     sample_query = "What are the latest trends in cryptocurrency?"
@@ -0,0 +1,108 @@
+import os
+from dataclasses import dataclass
+
+from modules.response_cache import skip_caching
+from modules.task_graph import TaskGraph
+from modules.tracing import trace
+
+TOOL_TIMEOUT = 60
+
+SYNTHESIS_PROMPT = (
+    "You are a cryptocurrency research assistant. Answer the user's question using only "
+    "the tool results below. Combine them into one concise answer and mention any tool "
+    "that failed.\n\n"
+    "Question: {query}\n\n"
+    "{results}\n\n"
+    "Answer:"
+)
+
+
+@dataclass
+class ToolCall:
+    """One independent step of a plan: a named tool applied to the query."""
+    name: str
+    run: object  # Callable taking no arguments and returning the tool's text output
+
+
+def plan(query: str, route, tools: dict, extra_tools: dict = None) -> list:
+    """
+    Decomposes a compound query into independent tool calls, one per intent
+    the router matched (plus any `extra_tools`, e.g. web search).
+
+    Args:
+        route: The router's Route for `query`.
+        tools (dict): intent -> (tool name, handler(query, route)).
+        extra_tools (dict): tool name -> handler(query, route), always included.
+    """
+    calls = []
+    for intent in route.intents:
+        if intent in tools:
+            name, handler = tools[intent]
+            calls.append(ToolCall(name, lambda handler=handler: handler(query, route)))
+    for name, handler in (extra_tools or {}).items():
+        calls.append(ToolCall(name, lambda handler=handler: handler(query, route)))
+    trace("planner.plan", tools=",".join(call.name for call in calls))
+    return calls
+
+
+def execute(calls, timeout: float = TOOL_TIMEOUT) -> dict:
+    """
+    Runs every call concurrently and returns {tool name: output}. A failed or
+    timed-out tool yields an error line instead, so synthesis can mention it,
+    and the answer built from it is kept out of the response cache.
+    """
+    graph = TaskGraph(max_workers=max(len(calls), 1))
+    for call in calls:
+        graph.add(call.name, call.run, timeout=timeout)
+    report = graph.run()
+    trace("planner.execute", timings=report["timings"], errors=len(report["errors"]))
+
+    outputs = {}
+    for call in calls:
+        if call.name in report["results"]:
+            outputs[call.name] = str(report["results"][call.name])
+        else:
+            outputs[call.name] = f"(failed: {report['errors'].get(call.name, 'no result')})"
+            skip_caching(f"{call.name} failed")
+    return outputs
+
+
+def synthesis_prompt(query: str, outputs: dict) -> str:
+    results = "\n\n".join(f"### {name}\n{output}" for name, output in outputs.items())
+    return SYNTHESIS_PROMPT.format(query=query, results=results)
+
+
+def get_synthesis_llm():
+    """Returns the LLM used for the final merge step; CHAT_BACKEND=fake works offline."""
+    from modules.streaming import FakeStreamingLLM, chat_backend
+
+    if chat_backend() == "fake":
+        return FakeStreamingLLM(response="Here is what the tools found.")
+
+    from langchain_community.llms import OpenAI
+    return OpenAI(openai_api_key=os.getenv("OPENAI_API_KEY"), temperature=0, streaming=True)
+
+
+def run_plan(query: str, calls, llm=None) -> str:
+    """Executes the plan's tools concurrently, then merges them in a single LLM call."""
+    outputs = execute(calls)
+    llm = llm or get_synthesis_llm()
+    return llm.predict(synthesis_prompt(query, outputs))
+
+
+def stream_plan(query: str, calls, llm=None):
+    """
+    Streaming counterpart of run_plan(): tool start events, tool end events
+    once every tool has finished, then the synthesis tokens.
+    """
+    from modules.streaming import TOOL_END, TOOL_START, StreamEvent, stream_langchain
+
+    for call in calls:
+        yield StreamEvent(TOOL_START, call.name)
+    outputs = execute(calls)
+    for name, output in outputs.items():
+        yield StreamEvent(TOOL_END, output)
+
+    llm = llm or get_synthesis_llm()
+    prompt = synthesis_prompt(query, outputs)
+    yield from stream_langchain(lambda callbacks: llm.predict(prompt, callbacks=callbacks))
@@ -1,52 +1,114 @@
 import os
+import time
 import requests
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from modules.agent_registry import get_agent
+from modules.price_cache import PriceDataError, get_candle_cache
+from modules.single_flight import SingleFlight
+from config.settings import HTTP_SETTINGS
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("FINANCIAL_DATASETS_API_KEY")
 
-class PriceAgent:
-    BASE_URL = "https://api.financialdatasets.ai/crypto/prices"
+PRICE_SOURCE = "financialdatasets.ai"
+
+
+@dataclass
+class PriceQuote:
+    """Latest known price of one ticker, or the reason there is none."""
+
+    ticker: str
+    price: float = None
+    timestamp: int = None      # Start of the latest bar (epoch seconds)
+    source: str = PRICE_SOURCE
+    staleness: float = None    # Seconds since the bar was last confirmed upstream
+    error: str = None
+
+    @property
+    def ok(self) -> bool:
+        return self.price is not None
+
+
+def format_quote(quote: PriceQuote) -> str:
+    """Renders a quote as the one-line answer the agents return."""
+    if quote.ok:
+        return f"The latest price for {quote.ticker} is ${quote.price:.2f} USD."
+    return quote.error
+
+
+def format_quotes(quotes: dict) -> str:
+    """Renders several quotes, one line each, in the order given."""
+    return "\n".join(format_quote(quote) for quote in quotes.values())
 
-    def __init__(self):
+
+class PriceAgent:
+    def __init__(self, max_workers: int = None):
         if not API_KEY:
             raise ValueError("❌ ERROR: Financial Datasets API Key is missing!")
+        # Requests beyond the per-host connection cap would only queue in the HTTP client
+        self.max_workers = max_workers or HTTP_SETTINGS["max_connections_per_host"]
+        # Quotes are only shared while in flight; the candle cache handles freshness
+        self._flight = SingleFlight(fresh_for=0)
 
-    def get_crypto_price(self, ticker: str, interval: str = "day", interval_multiplier: int = 1) -> str:
-        """Fetches the latest cryptocurrency price from Financial Datasets API."""
-        headers = {"X-API-KEY": API_KEY}
+    def _fetch_quote(self, ticker: str, interval: str, interval_multiplier: int) -> PriceQuote:
+        # Last 7 days of bars; closed bars come from the local candle cache
+        today = date.today()
+        seven_days_ago = today - timedelta(days=7)
+        cache = get_candle_cache()
+        symbol = f"{ticker}-USD"
+
+        try:
+            candles = cache.get(symbol, seven_days_ago, today, interval, interval_multiplier)
+        except PriceDataError as e:
+            return PriceQuote(ticker, error=f"❌ API Error {e.status_code}: {e.text}")
+        except requests.exceptions.RequestException as e:
+            return PriceQuote(ticker, error=f"❌ API Error: {e}")
 
-        # Get today's date and a past date (7 days ago)
-        today = datetime.today().strftime('%Y-%m-%d')
-        seven_days_ago = (datetime.today() - timedelta(days=7)).strftime('%Y-%m-%d')
+        if not len(candles["close"]):  # ✅ Prevents KeyError if no data is returned
+            return PriceQuote(ticker, error=f"⚠️ No price data available for {ticker} in the selected date range.")
 
-        params = {
-            "ticker": f"{ticker}-USD",
-            "interval": "day",  # ✅ Using 'day' instead of 'minute'
-            "interval_multiplier": 1,
-            "start_date": seven_days_ago,  # ✅ Fetch last 7 days of data
-            "end_date": today
-        }
+        return PriceQuote(
+            ticker,
+            price=float(candles["close"][-1]),
+            timestamp=int(candles["time"][-1]),
+            staleness=time.time() - cache.checked_at(symbol, interval, interval_multiplier),
+        )
 
-        print(f"🔍 DEBUG: Sending request to {self.BASE_URL}")
-        print(f"🔍 DEBUG: Headers = {headers}")
-        print(f"🔍 DEBUG: Params = {params}")
+    def get_quote(self, ticker: str, interval: str = "day", interval_multiplier: int = 1) -> PriceQuote:
+        """
+        Returns the latest quote for one ticker. Concurrent calls for the same
+        ticker share a single fetch instead of each issuing their own.
+        """
+        return self._flight.do((ticker, interval, interval_multiplier),
+                               lambda: self._fetch_quote(ticker, interval, interval_multiplier))
 
-        response = requests.get(self.BASE_URL, params=params, headers=headers)
+    def get_quotes(self, tickers, interval: str = "day", interval_multiplier: int = 1) -> dict:
+        """
+        Fetches quotes for many tickers concurrently over the shared connection pool.
 
-        if response.status_code == 200:
-            data = response.json()
-            print(f"🔍 DEBUG: API Response JSON = {data}")  # ✅ Prints full API response
+        Args:
+            tickers (list): Coin symbols, e.g. ["BTC", "ETH"]; duplicates are fetched once.
 
-            # ✅ Fix: Correctly access the list of prices
-            prices = data.get("prices", {}).get("prices", [])
+        Returns:
+            dict: ticker -> PriceQuote, in the order the tickers were first given.
+        """
+        unique = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        if len(unique) <= 1:
+            return {ticker: self.get_quote(ticker, interval, interval_multiplier) for ticker in unique}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as pool:
+            quotes = pool.map(lambda ticker: self.get_quote(ticker, interval, interval_multiplier), unique)
+            return dict(zip(unique, quotes))
+
+    def get_crypto_price(self, ticker: str, interval: str = "day", interval_multiplier: int = 1) -> str:
+        """Fetches the latest cryptocurrency price from Financial Datasets API."""
+        return format_quote(self.get_quote(ticker, interval, interval_multiplier))
 
-            if not prices:  # ✅ Prevents KeyError if no data is returned
-                return f"⚠️ No price data available for {ticker} in the selected date range."
 
-            latest_price = prices[-1]  # ✅ Get the most recent price entry
-            return f"The latest price for {ticker} is ${latest_price['close']:.2f} USD."
-        else:
-            return f"❌ API Error {response.status_code}: {response.text}"
+def get_price_agent() -> PriceAgent:
+    """Returns the shared PriceAgent, constructing it on first use."""
+    return get_agent("price_agent", PriceAgent)
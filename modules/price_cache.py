@@ -0,0 +1,240 @@
+import os
+import re
+import time
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from dotenv import load_dotenv
+
+from modules.http_client import get_http_client
+from modules.json_stream import iter_records
+from modules.tracing import span
+
+load_dotenv()
+
+PRICES_URL = "https://api.financialdatasets.ai/crypto/prices/"
+CACHE_DIR = os.path.join("data", "price_cache")
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# Seconds covered by one bar of each interval (times interval_multiplier)
+INTERVAL_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 31 * 86400,
+    "year": 366 * 86400,
+}
+
+# How long the still-forming latest bar is trusted before it is refetched
+OPEN_BAR_TTL = int(os.getenv("PRICE_OPEN_BAR_TTL", "60"))
+
+
+class PriceDataError(Exception):
+    """Raised when the price API answers with a non-200 status."""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"{status_code}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+def fetch_price_rows(ticker, interval, interval_multiplier, start_date, end_date) -> list:
+    """Downloads raw price bars for [start_date, end_date] from financialdatasets.ai."""
+    api_key = os.getenv("FINANCIAL_DATASETS_API_KEY")
+    params = {
+        "ticker": ticker,
+        "interval": interval,
+        "interval_multiplier": interval_multiplier,
+        "start_date": start_date.strftime('%Y-%m-%d'),
+        "end_date": end_date.strftime('%Y-%m-%d'),
+        "limit": 5000
+    }
+    response = get_http_client().get(PRICES_URL, headers={"X-API-KEY": api_key}, params=params, stream=True)
+    if response.status_code != 200:
+        with response:
+            raise PriceDataError(response.status_code, response.text)
+
+    # Up to 5000 bars: parse them incrementally into compact records
+    with span("prices.fetch", ticker=ticker, start=params["start_date"], end=params["end_date"]) as fields:
+        rows = list(iter_records(response, "prices.prices.item", ("time",) + FIELDS, stats=fields))
+        fields["records"] = len(rows)
+    return rows
+
+
+def _rows_to_columns(rows) -> dict:
+    """Converts API rows into sorted, de-duplicated columnar arrays."""
+    import pandas as pd  # Deferred: only needed when new bars arrive
+
+    rows = [row for row in rows if row.get("time")]
+    times = pd.to_datetime(pd.Series([row["time"] for row in rows], dtype=object), utc=True)
+    columns = {"time": times.dt.tz_convert(None).values.astype("datetime64[s]").astype(np.int64)}
+    for field in FIELDS:
+        columns[field] = np.array([row.get(field, np.nan) for row in rows], dtype=np.float64)
+
+    _, unique = np.unique(columns["time"][::-1], return_index=True)
+    # Keep the last occurrence of each timestamp, in time order
+    order = len(rows) - 1 - unique
+    return {name: values[order] for name, values in columns.items()}
+
+
+def _empty_columns() -> dict:
+    columns = {"time": np.empty(0, dtype=np.int64)}
+    columns.update({field: np.empty(0, dtype=np.float64) for field in FIELDS})
+    return columns
+
+
+def _slice(columns, start_date, end_date) -> dict:
+    """Returns the bars between start_date and end_date (inclusive)."""
+    lower = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc).timestamp()
+    upper = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc).timestamp()
+    lo, hi = np.searchsorted(columns["time"], [lower, upper])
+    return {name: values[lo:hi] for name, values in columns.items()}
+
+
+class CandleCache:
+    """
+    Local columnar cache of OHLC bars keyed by (ticker, interval, interval_multiplier).
+
+    Each series is stored as NumPy arrays in one .npz file. Requests only
+    download the date ranges missing at the left and right edges of what is
+    already held; closed bars are never refetched, and the latest (possibly
+    still open) bar is refreshed once it is older than OPEN_BAR_TTL seconds.
+    A range that comes back empty is not recorded as covered and is asked
+    for again after the same TTL.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, fetch=fetch_price_rows, open_bar_ttl: int = OPEN_BAR_TTL):
+        self.directory = directory
+        self.fetch = fetch
+        self.open_bar_ttl = open_bar_ttl
+        os.makedirs(directory, exist_ok=True)
+        self._series = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key):
+        # One lock per series so different tickers can be fetched in parallel
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _path(self, key):
+        name = "_".join(str(part) for part in key)
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", name) + ".npz")
+
+    def _load(self, key) -> dict:
+        if key in self._series:
+            return self._series[key]
+        # empty_at: when a range fetch last came back empty (kept in memory only)
+        series = {"columns": _empty_columns(), "covered_from": None, "checked_at": 0.0, "empty_at": 0.0}
+        path = self._path(key)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                series["columns"] = {name: data[name] for name in ("time",) + FIELDS}
+                series["covered_from"] = date.fromordinal(int(data["covered_from"])) if data["covered_from"] else None
+                series["checked_at"] = float(data["checked_at"])
+            if not len(series["columns"]["time"]):
+                # Written by an older version after an empty fetch; fetch it again
+                series["covered_from"] = None
+        self._series[key] = series
+        return series
+
+    def _save(self, key, series):
+        path = self._path(key)
+        tmp_path = path + ".tmp.npz"
+        covered_from = series["covered_from"].toordinal() if series["covered_from"] else 0
+        np.savez(tmp_path, covered_from=covered_from, checked_at=series["checked_at"], **series["columns"])
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _merge(columns, new, replace_from=None) -> dict:
+        """Adds new bars; existing bars before `replace_from` (closed) are kept as-is."""
+        if not len(new["time"]):
+            return columns
+        keep = np.ones(len(new["time"]), dtype=bool)
+        closed = columns["time"] if replace_from is None else columns["time"][columns["time"] < replace_from]
+        keep &= ~np.isin(new["time"], closed)
+        if replace_from is not None:
+            stale = columns["time"] >= replace_from
+            columns = {name: values[~stale] for name, values in columns.items()}
+        merged = {name: np.concatenate([columns[name], new[name][keep]]) for name in columns}
+        order = np.argsort(merged["time"], kind="stable")
+        return {name: values[order] for name, values in merged.items()}
+
+    def get(self, ticker, start_date, end_date, interval="day", interval_multiplier=1) -> dict:
+        """
+        Returns bars between start_date and end_date (inclusive) as columnar arrays.
+
+        Args:
+            start_date (date): First day of the requested range.
+            end_date (date): Last day of the requested range.
+
+        Returns:
+            dict: "time" (epoch seconds) plus one float array per OHLCV field.
+        """
+        key = (ticker, interval, interval_multiplier)
+        bar_seconds = INTERVAL_SECONDS.get(interval, 86400) * interval_multiplier
+
+        with self._key_lock(key):
+            series = self._load(key)
+            columns = series["columns"]
+            changed = False
+
+            missing = series["covered_from"] is None or start_date < series["covered_from"]
+            # An empty reply is retried after the TTL instead of marking the range covered
+            if missing and time.time() - series["empty_at"] > self.open_bar_ttl:
+                left_end = end_date
+                if len(columns["time"]):
+                    first_day = datetime.fromtimestamp(int(columns["time"][0]), tz=timezone.utc).date()
+                    left_end = min(end_date, first_day)
+                rows = self.fetch(ticker, interval, interval_multiplier, start_date, left_end)
+                if rows:
+                    columns = self._merge(columns, _rows_to_columns(rows))
+                    series["covered_from"] = start_date
+                    series["checked_at"] = time.time() if left_end == end_date else series["checked_at"]
+                    changed = True
+                else:
+                    series["empty_at"] = time.time()
+
+            if len(columns["time"]):
+                last_bar = int(columns["time"][-1])
+                last_day = datetime.fromtimestamp(last_bar, tz=timezone.utc).date()
+                bar_is_open = last_bar + bar_seconds > time.time()
+                stale = time.time() - series["checked_at"] > self.open_bar_ttl
+                if end_date >= last_day and stale and (bar_is_open or end_date > last_day):
+                    rows = self.fetch(ticker, interval, interval_multiplier, last_day, end_date)
+                    columns = self._merge(columns, _rows_to_columns(rows), replace_from=last_bar)
+                    series["checked_at"] = time.time()
+                    changed = True
+
+            series["columns"] = columns
+            if changed:
+                self._save(key, series)
+            return _slice(columns, start_date, end_date)
+
+    def cached(self, ticker, start_date, end_date, interval="day", interval_multiplier=1) -> dict:
+        """Like get(), but only returns bars already held locally; never calls upstream."""
+        key = (ticker, interval, interval_multiplier)
+        with self._key_lock(key):
+            return _slice(self._load(key)["columns"], start_date, end_date)
+
+    def checked_at(self, ticker, interval="day", interval_multiplier=1) -> float:
+        """Returns when the newest bars of a series were last confirmed upstream (epoch seconds)."""
+        key = (ticker, interval, interval_multiplier)
+        with self._key_lock(key):
+            return self._load(key)["checked_at"]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_candle_cache() -> CandleCache:
+    """Returns the process-wide candle cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CandleCache()
+        return _cache
@@ -0,0 +1,83 @@
+import os
+import threading
+import contextvars
+from contextlib import contextmanager
+
+from modules.fetch_news import fetch_news
+from modules.gov_news_agent import fetch_regulations_gov_news
+from modules.price_agent import get_price_agent
+
+_current = contextvars.ContextVar("request_context", default=None)
+
+
+class RequestContext:
+    """
+    Memoizes upstream fetches for the duration of one request or scheduler tick.
+
+    Each key is fetched at most once; concurrent callers asking for the same
+    key wait for the first fetch instead of issuing their own.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def memoize(self, key, fetch):
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._results:
+                self._results[key] = fetch()
+            return self._results[key]
+
+
+@contextmanager
+def request_context():
+    """
+    Opens a request context, or joins the one already active so nested
+    calls (e.g. agent tools inside interpret_query) share its results.
+    """
+    context = _current.get()
+    if context is not None:
+        yield context
+        return
+
+    context = RequestContext()
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
+
+
+def memoized(key, fetch):
+    """Runs `fetch` through the active request context, or directly if there is none."""
+    context = _current.get()
+    if context is None:
+        return fetch()
+    return context.memoize(key, fetch)
+
+
+def get_news() -> list:
+    return memoized(("news",), fetch_news)
+
+
+def get_price(ticker: str) -> str:
+    return memoized(("price", ticker), lambda: get_price_agent().get_crypto_price(ticker))
+
+
+def get_quotes(tickers) -> dict:
+    """Returns ticker -> PriceQuote for a batch of tickers, fetched concurrently."""
+    tickers = tuple(dict.fromkeys(ticker.upper() for ticker in tickers))
+    return memoized(("quotes", tickers), lambda: get_price_agent().get_quotes(tickers))
+
+
+def get_regulations(query: str = "crypto", page_size: int = 10) -> list:
+    return memoized(
+        ("regulations", query, page_size),
+        lambda: fetch_regulations_gov_news(os.getenv("REGULATIONS_GOV_API_KEY"), query=query, page_size=page_size),
+    )
@@ -0,0 +1,213 @@
+import os
+import re
+import time
+import hashlib
+import threading
+import contextvars
+import unicodedata
+
+import numpy as np
+
+from modules.entity_index import extract_tickers
+from modules.kv_cache import PersistentCache
+
+CACHE_PATH = os.path.join("data", "response_cache.db")
+CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2000"))
+CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+# Cosine similarity at which a differently worded question reuses an answer; unset disables it
+SIMILARITY_THRESHOLD = os.getenv("RESPONSE_CACHE_SIMILARITY")
+
+# Reasons the answer being computed must not be cached; None outside answer()/stream()
+_uncacheable = contextvars.ContextVar("uncacheable_answer", default=None)
+
+
+def skip_caching(reason: str):
+    """Marks the answer being computed as not cacheable, e.g. because a tool returned an error."""
+    reasons = _uncacheable.get()
+    if reasons is not None:
+        reasons.append(reason)
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a question: case-, punctuation- and whitespace-insensitive."""
+    text = unicodedata.normalize("NFKC", query).lower()
+    return " ".join(re.sub(r"[^\w\s$.-]", " ", text).split()).strip(" .")
+
+
+class ResponseCache:
+    """
+    Persistent cache of chatbot/agent answers shared by every Streamlit session.
+
+    Answers are keyed on (scope, corpus version, normalized question), so
+    ingesting new articles bumps the version and old answers stop matching.
+    With a similarity threshold, a question that misses exactly is embedded
+    and may reuse the answer of the closest question asked at that version
+    about the same coins. Their vectors are kept in one in-memory matrix per
+    (scope, version), loaded from disk the first time that pair is searched.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_SIZE, ttl: float = CACHE_TTL,
+                 similarity_threshold: float = None, embed=None):
+        self.cache = PersistentCache(path, max_entries=max_entries, ttl=ttl)
+        self.similarity_threshold = similarity_threshold
+        self._embed = embed
+        # (scope, version) -> {"keys", "tickers", "at", "vectors", "stacked"} for the similarity scan
+        self._matrices = {}
+        self._matrix_lock = threading.Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        if self._embed is None:
+            from modules.vector_index import get_vector_index
+            self._embed = get_vector_index().embeddings.embed_query
+        vector = np.asarray(self._embed(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def key(scope: str, version, normalized: str) -> str:
+        return hashlib.sha256(f"{scope}|{version}|{normalized}".encode("utf-8")).hexdigest()
+
+    def _fresh(self, entry, ttl) -> bool:
+        return ttl is None or time.time() - entry["at"] <= ttl
+
+    def get(self, scope: str, query: str, version, ttl: float = None):
+        """
+        Returns the cached answer for `query`, or None.
+
+        Args:
+            ttl (float): Optional tighter expiry for this scope (e.g. answers quoting prices).
+        """
+        normalized = normalize_query(query)
+        entry = self.cache.get(self.key(scope, version, normalized))
+        if entry is not None and self._fresh(entry, ttl):
+            return entry["answer"]
+        if self.similarity_threshold is None:
+            return None
+
+        tickers = set(extract_tickers(query))
+        query_vector = self.embed(normalized)
+        with self._matrix_lock:
+            matrix = self._matrix(scope, version)
+            if not matrix["keys"]:
+                return None
+            if matrix["stacked"] is None:
+                matrix["stacked"] = np.vstack(matrix["vectors"])
+            scores = matrix["stacked"] @ query_vector
+            for i in np.argsort(scores)[::-1]:
+                if scores[i] < self.similarity_threshold:
+                    return None
+                # "BTC price" and "ETH price" embed alike but must not share an answer
+                if matrix["tickers"][i] == tickers and (ttl is None or time.time() - matrix["at"][i] <= ttl):
+                    key = matrix["keys"][i]
+                    break
+            else:
+                return None
+        entry = self.cache.get(key)
+        return entry["answer"] if entry is not None else None
+
+    def _matrix(self, scope: str, version):
+        """Returns the similarity rows for (scope, version); older versions of the scope are dropped."""
+        if (scope, version) not in self._matrices:
+            for stale in [k for k in self._matrices if k[0] == scope]:
+                del self._matrices[stale]
+            matrix = {"keys": [], "tickers": [], "at": [], "vectors": [], "stacked": None}
+            for key, value in self.cache.items():
+                if value["scope"] == scope and value["version"] == version and value.get("vector"):
+                    self._add_row(matrix, key, value)
+            self._matrices[(scope, version)] = matrix
+        return self._matrices[(scope, version)]
+
+    @staticmethod
+    def _add_row(matrix, key, entry):
+        matrix["keys"].append(key)
+        matrix["tickers"].append(set(entry.get("tickers", ())))
+        matrix["at"].append(entry["at"])
+        matrix["vectors"].append(np.asarray(entry["vector"], dtype=np.float32))
+        matrix["stacked"] = None  # Restacked on the next search
+
+    def set(self, scope: str, query: str, version, answer: str):
+        normalized = normalize_query(query)
+        entry = {"scope": scope, "version": version, "query": normalized, "answer": answer, "at": time.time()}
+        key = self.key(scope, version, normalized)
+        if self.similarity_threshold is not None:
+            entry["vector"] = self.embed(normalized).round(5).tolist()
+            entry["tickers"] = extract_tickers(query)
+            with self._matrix_lock:
+                if (scope, version) in self._matrices:
+                    self._add_row(self._matrices[(scope, version)], key, entry)
+        self.cache.set(key, entry)
+
+    def answer(self, scope: str, query: str, compute, ttl: float = None) -> str:
+        """
+        Returns the cached answer for `query` at the current corpus version,
+        computing it on a miss. Answers marked with skip_caching() are not stored.
+        """
+        version = corpus_version()
+        cached = self.get(scope, query, version, ttl)
+        if cached is not None:
+            return cached
+        reasons = []
+        token = _uncacheable.set(reasons)
+        try:
+            answer = compute()
+        finally:
+            _uncacheable.reset(token)
+            _propagate(reasons)
+        if answer and not reasons:
+            self.set(scope, query, version, answer)
+        return answer
+
+    def stream(self, scope: str, query: str, stream, ttl: float = None):
+        """
+        Streaming counterpart of answer(): a hit is yielded as a single token;
+        a miss streams `stream()` and caches the joined answer tokens.
+        """
+        from modules.streaming import TOKEN, StreamEvent
+
+        version = corpus_version()
+        cached = self.get(scope, query, version, ttl)
+        if cached is not None:
+            yield StreamEvent(TOKEN, cached)
+            return
+
+        tokens = []
+        reasons = []
+        token = _uncacheable.set(reasons)
+        try:
+            for event in stream():
+                if event.kind == TOKEN:
+                    tokens.append(event.text)
+                yield event
+        finally:
+            try:
+                _uncacheable.reset(token)
+            except ValueError:
+                pass  # Generator closed from another context; that context never saw the flag
+            _propagate(reasons)
+        if tokens and not reasons:
+            self.set(scope, query, version, "".join(tokens))
+
+
+def _propagate(reasons):
+    # A nested cached call that failed also spoils the answer wrapping it
+    for reason in reasons:
+        skip_caching(reason)
+
+
+def corpus_version() -> int:
+    from modules.article_store import get_store
+    return get_store().version()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide response cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            threshold = float(SIMILARITY_THRESHOLD) if SIMILARITY_THRESHOLD else None
+            _cache = ResponseCache(similarity_threshold=threshold)
+        return _cache
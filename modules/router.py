@@ -0,0 +1,100 @@
+import re
+from dataclasses import dataclass, field
+
+from modules.entity_index import get_entity_index
+from modules.tracing import trace
+
+PRICE = "price"
+NEWS = "news"
+SENTIMENT = "sentiment"
+SUMMARY = "summary"
+GRAPH = "graph"
+DATE = "date"
+
+# Checked in this order; the first match wins when a caller needs a single intent
+INTENT_PATTERNS = {
+    SENTIMENT: r"sentiment|tone|positive|negative|emotions?|feelings?|mood",
+    PRICE: r"prices?|cost|costs|value|worth|trading at|quote|quotes",
+    NEWS: r"news|headlines?|articles?",
+    SUMMARY: r"summari[sz]e|summary|summaries|tl;?dr",
+    GRAPH: r"graph|chart|plot",
+    DATE: r"day|date|today",
+}
+_INTENT_RULES = {intent: re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE) for intent, pattern in INTENT_PATTERNS.items()}
+
+# Words of the right-hand intents also appear in the left-hand ones' questions
+# ("summarize the news", "price chart", "btc price today"), so they are dropped
+SUBSUMES = {
+    SENTIMENT: {NEWS, DATE},
+    PRICE: {DATE},
+    NEWS: {DATE},
+    SUMMARY: {NEWS, DATE},
+    GRAPH: {PRICE, DATE},
+}
+
+# Words that may sit between coin names in a bare coin query ("BTC vs ETH")
+BARE_COIN_FILLER = {"and", "or", "vs", "versus", "please"}
+
+
+@dataclass
+class Route:
+    """
+    Outcome of classifying a query.
+
+    `intent` is set only when the query maps confidently onto one tool;
+    `intents` lists every intent whose rules matched, in priority order.
+    """
+    intent: str = None
+    intents: list = field(default_factory=list)
+    tickers: list = field(default_factory=list)
+
+    @property
+    def compound(self) -> bool:
+        return len(self.intents) > 1
+
+
+def classify(query: str) -> Route:
+    """
+    Classifies a query with keyword rules and the coin entity index.
+
+    A query is routed directly only when exactly one intent matches and a
+    price question names a coin. A query that is nothing but coin names
+    ("BTC", "bitcoin vs ether") counts as a price question; any other
+    mention ("Why did bitcoin drop?") is left for the LLM agent, as is
+    anything compound.
+    """
+    intents = [intent for intent, rule in _INTENT_RULES.items() if rule.search(query)]
+    subsumed = set().union(*(SUBSUMES.get(intent, ()) for intent in intents))
+    intents = [intent for intent in intents if intent not in subsumed]
+    mentions = get_entity_index().find(query)
+    tickers = list(dict.fromkeys(mention.symbol for mention in mentions))
+    if not intents and tickers and _only_coins(query, mentions):
+        intents = [PRICE]
+
+    route = Route(intents=intents, tickers=tickers)
+    if len(intents) == 1 and (intents[0] != PRICE or tickers):
+        route.intent = intents[0]
+    trace("router.classify", intent=route.intent, intents=",".join(intents), tickers=",".join(tickers))
+    return route
+
+
+def _only_coins(query: str, mentions) -> bool:
+    """True when the query has no words besides coin mentions and filler like "vs"."""
+    rest = list(query)
+    for mention in mentions:
+        rest[mention.start:mention.end] = " " * (mention.end - mention.start)
+    words = re.findall(r"[^\W_]+", "".join(rest).lower())
+    return all(word in BARE_COIN_FILLER for word in words)
+
+
+def dispatch(route: Route, handlers: dict, query: str):
+    """
+    Runs the handler registered for the route's intent.
+
+    Returns the handler's answer, or None when the route is not confident
+    or the caller has no handler for it (the caller then falls back).
+    """
+    handler = handlers.get(route.intent)
+    if handler is None:
+        return None
+    return handler(query, route)
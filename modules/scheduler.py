@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+from datetime import date, timedelta
+
+from config.settings import SCHEDULER_SETTINGS
+from modules.http_client import get_http_client
+
+STATE_PATH = os.path.join("data", "scheduler_state.json")
+
+
+def fingerprint(result) -> str:
+    """Stable digest of a job result, used to detect unchanged upstream data."""
+    payload = json.dumps(result, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Job:
+    """
+    A periodic ingestion task.
+
+    `fetch` runs in a worker thread and returns the upstream data;
+    `on_change`, if given, only runs when that data differs from the last run.
+    With `empty_is_unchanged`, an empty result never counts as a change
+    (e.g. a fetch that only returns what is new since the last run).
+    """
+
+    def __init__(self, name: str, fetch, interval: float, on_change=None, empty_is_unchanged: bool = False):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.on_change = on_change
+        self.empty_is_unchanged = empty_is_unchanged
+        self.lock = asyncio.Lock()
+
+
+class IngestionDaemon:
+    """
+    asyncio scheduler with one loop per job.
+
+    Each job runs on its own cadence with a jittered start, never overlaps
+    with itself, skips downstream work when its data has not changed, and
+    persists its last-run state so a restart does not refetch early.
+    Counters are served in Prometheus text format on /metrics.
+    """
+
+    def __init__(self, jobs, state_path: str = STATE_PATH, jitter: float = 30.0, metrics_port: int = None):
+        self.jobs = {job.name: job for job in jobs}
+        self.state_path = state_path
+        self.jitter = jitter
+        self.metrics_port = metrics_port
+        self.state = self._load_state()
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _job_state(self, name) -> dict:
+        return self.state.setdefault(name, {
+            "last_run": 0.0, "last_success": 0.0, "fingerprint": None, "last_duration": 0.0,
+            "runs": 0, "changed": 0, "unchanged": 0, "failures": 0, "overlaps_skipped": 0,
+        })
+
+    async def run_job(self, job: Job):
+        """Runs one job now unless a previous run of it is still in progress."""
+        state = self._job_state(job.name)
+        if job.lock.locked():
+            state["overlaps_skipped"] += 1
+            return
+
+        async with job.lock:
+            start = time.time()
+            state["last_run"] = start
+            state["runs"] += 1
+            try:
+                result = await asyncio.to_thread(job.fetch)
+                digest = fingerprint(result)
+                if digest == state["fingerprint"] or (job.empty_is_unchanged and not result):
+                    state["unchanged"] += 1
+                    logging.info(f"⏭️ {job.name}: upstream unchanged, skipping downstream work")
+                else:
+                    if job.on_change is not None:
+                        await asyncio.to_thread(job.on_change, result)
+                    state["fingerprint"] = digest
+                    state["changed"] += 1
+                state["last_success"] = time.time()
+            except Exception as e:
+                state["failures"] += 1
+                logging.error(f"❌ {job.name} failed: {e}")
+            finally:
+                state["last_duration"] = time.time() - start
+                self._save_state()
+
+    async def _job_loop(self, job: Job):
+        state = self._job_state(job.name)
+        # Resume the cadence from the persisted last run instead of refetching on restart
+        delay = max(0.0, state["last_run"] + job.interval - time.time())
+        delay += random.uniform(0, self.jitter)
+        while True:
+            await asyncio.sleep(delay)
+            started = time.time()
+            await self.run_job(job)
+            delay = max(0.0, job.interval - (time.time() - started)) + random.uniform(0, self.jitter)
+
+    def metrics(self) -> str:
+        lines = []
+        for name in self.jobs:
+            state = self._job_state(name)
+            for field in ("runs", "changed", "unchanged", "failures", "overlaps_skipped"):
+                lines.append(f'ingest_job_{field}_total{{job="{name}"}} {state[field]}')
+            lines.append(f'ingest_job_last_success_timestamp{{job="{name}"}} {state["last_success"]}')
+            lines.append(f'ingest_job_last_duration_seconds{{job="{name}"}} {state["last_duration"]:.3f}')
+        for endpoint, stats in get_http_client().latency_stats().items():
+            cumulative = 0
+            for upper, count in stats["buckets"].items():
+                cumulative += count
+                le = "+Inf" if upper == float("inf") else f"{upper / 1000:g}"
+                lines.append(f'http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_count{{endpoint="{endpoint}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    async def _serve_metrics(self, reader, writer):
+        request_line = await reader.readline()
+        # Drain the request headers
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        path = request_line.split()[1].decode() if len(request_line.split()) > 1 else "/"
+        if path == "/metrics":
+            status, body = "200 OK", self.metrics()
+        else:
+            status, body = "404 Not Found", "not found\n"
+        payload = body.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("utf-8") + payload
+        )
+        await writer.drain()
+        writer.close()
+
+    async def run_forever(self):
+        if self.metrics_port:
+            self._metrics_server = await asyncio.start_server(self._serve_metrics, "127.0.0.1", self.metrics_port)
+            print(f"📈 Metrics available at http://127.0.0.1:{self.metrics_port}/metrics")
+        await asyncio.gather(*(self._job_loop(job) for job in self.jobs.values()))
+
+
+def _fetch_news():
+    """
+    Stores new articles and returns the corpus version. The fingerprint only
+    advances once on_change succeeds, so a failed run is retried next tick.
+    """
+    from modules.article_store import get_store
+    from modules.fetch_news import ingest_news
+    ingest_news()
+    return get_store().version()
+
+
+def _summarize(_version):
+    """
+    Rewrites the snapshot, then summarizes the latest stored articles (cached
+    ones are free). The snapshot does not depend on summaries, so a failed
+    LLM call is only logged instead of keeping new articles off the dashboard.
+    """
+    from modules.summarizer import summarize_articles
+    _write_snapshot()
+    try:
+        summarize_articles()
+    except Exception as e:
+        logging.error(f"❌ Summarizing new articles failed: {e}")
+
+
+def _write_snapshot(events=None):
+    """Rebuilds the dashboard snapshot from local data after an upstream change."""
+    from modules.snapshot import build_snapshot
+    build_snapshot(events=events)
+
+
+def _fetch_regulations():
+    from modules.gov_news_agent import fetch_regulations_gov_news
+    return fetch_regulations_gov_news(os.getenv("REGULATIONS_GOV_API_KEY"))
+
+
+def _refresh_prices(tickers, days):
+    """Tops up the candle cache; returns the latest bar per ticker."""
+    from modules.price_cache import get_candle_cache
+    today = date.today()
+    start = today - timedelta(days=days)
+    latest = {}
+    for ticker in tickers:
+        candles = get_candle_cache().get(ticker.strip(), start, today)
+        if len(candles["time"]):
+            latest[ticker] = [int(candles["time"][-1]), float(candles["close"][-1])]
+    return latest
+
+
+def build_daemon(settings: dict = None) -> IngestionDaemon:
+    """
+    Builds the default daemon: news hourly, regulations daily, prices per
+    interval. Any change rewrites the dashboard snapshot.
+    """
+    settings = {**SCHEDULER_SETTINGS, **(settings or {})}
+    jobs = [
+        Job("news", _fetch_news, settings["news_interval_minutes"] * 60, on_change=_summarize),
+        # fetch_regulations_gov_news returns [] on request errors; keep the last events instead
+        Job("regulations", _fetch_regulations, settings["regulations_interval_hours"] * 3600,
+            on_change=lambda events: _write_snapshot(events=events), empty_is_unchanged=True),
+        Job("prices", lambda: _refresh_prices(settings["price_tickers"], settings["price_history_days"]),
+            settings["prices_interval_minutes"] * 60, on_change=lambda _: _write_snapshot()),
+    ]
+    return IngestionDaemon(jobs, jitter=settings["jitter_seconds"], metrics_port=settings["metrics_port"])
@@ -1,72 +1,226 @@
-from textblob import TextBlob
+import os
+import hashlib
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from importlib.metadata import version as package_version
+
 import numpy as np
 
+from modules.kv_cache import PersistentCache
 
-def analyze_sentiment(articles):
+# Batches at least this large are scored across a process pool
+PARALLEL_THRESHOLD = 256
+CHUNK_SIZE = 64
+
+# Bump the suffix whenever scoring changes; cached scores from other versions are ignored
+MODEL_VERSION = f"textblob-{package_version('textblob')}-1"
+CACHE_PATH = os.path.join("data", "sentiment_cache.db")
+CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache() -> PersistentCache:
+    """Returns the process-wide, LRU-bounded sentiment score cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PersistentCache(CACHE_PATH, max_entries=CACHE_SIZE)
+        return _cache
+
+
+@dataclass
+class SentimentBatch:
     """
-    Analyzes sentiment for a list of articles and returns an overall sentiment score.
-    
+    Per-article sentiment for a batch of N articles.
+
+    Articles with no text are kept in place with zero scores and
+    `valid == False`; aggregates only consider valid articles.
+    """
+    polarity: np.ndarray
+    subjectivity: np.ndarray
+    valid: np.ndarray
+    labels: list
+
+    @property
+    def count(self) -> int:
+        return int(self.valid.sum())
+
+    @property
+    def avg_polarity(self) -> float:
+        return float(self.polarity[self.valid].mean()) if self.count else 0.0
+
+    @property
+    def avg_subjectivity(self) -> float:
+        return float(self.subjectivity[self.valid].mean()) if self.count else 0.0
+
+    @property
+    def std_polarity(self) -> float:
+        return float(self.polarity[self.valid].std()) if self.count > 1 else 0.0
+
+    @property
+    def overall(self) -> str:
+        return polarity_label(self.avg_polarity)
+
+    @property
+    def confidence(self) -> str:
+        # Confidence level based on standard deviation
+        std = self.std_polarity
+        return "High" if std < 0.3 else "Medium" if std < 0.5 else "Low"
+
+
+def polarity_label(polarity) -> str:
+    if polarity > 0.1:
+        return "Positive"
+    elif polarity < -0.1:
+        return "Negative"
+    return "Neutral"
+
+
+def article_text(article) -> str:
+    """Extract text from article (handle both string and dict inputs)."""
+    if isinstance(article, dict):
+        title = article.get('title', '') or ''
+        content = article.get('content', '') or ''
+        return f"{title} {content}"
+    return str(article)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used both for scoring and as the cache key."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _score_texts(texts) -> list:
+    """Runs TextBlob over a list of texts; top-level so it can run in worker processes."""
+    from textblob import TextBlob  # Deferred: fully cached batches never load it
+    scores = []
+    for text in texts:
+        sentiment = TextBlob(text).sentiment
+        scores.append((sentiment.polarity, sentiment.subjectivity))
+    return scores
+
+
+def _score_uncached(texts, workers) -> list:
+    if workers != 0 and len(texts) >= PARALLEL_THRESHOLD:
+        chunks = [texts[i:i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return [score for chunk in pool.map(_score_texts, chunks) for score in chunk]
+    return _score_texts(texts)
+
+
+def score_articles(articles, workers: int = None, use_cache: bool = True) -> SentimentBatch:
+    """
+    Scores every article and returns structured per-article results.
+
     Args:
         articles: List of article texts or list of dictionaries containing article data
-    
+        workers: Process pool size for large batches; 0 forces in-process scoring
+        use_cache: Reuse persisted scores for texts seen before
+
     Returns:
-        str: Formatted string containing sentiment analysis results
+        SentimentBatch: Polarity/subjectivity arrays, validity mask and labels
     """
-    total_polarity = 0
-    total_subjectivity = 0
-    polarities = []
-    valid_articles = 0
-
-    # Handle different input types
     if isinstance(articles, str):
         articles = [articles]
-    
-    for article in articles:
-        # Extract text from article (handle both string and dict inputs)
-        if isinstance(article, dict):
-            title = article.get('title', '') or ''
-            content = article.get('content', '') or ''
-            full_text = f"{title} {content}"
-        else:
-            full_text = str(article)
-        
-        if not full_text.strip():
-            continue
-
-        # Perform sentiment analysis
-        analysis = TextBlob(full_text)
-        polarity = analysis.sentiment.polarity
-        subjectivity = analysis.sentiment.subjectivity
-        
-        total_polarity += polarity
-        total_subjectivity += subjectivity
-        polarities.append(polarity)
-        valid_articles += 1
-
-    if valid_articles == 0:
-        print("No valid articles found for sentiment analysis.")  # Debugging line
-        return "No valid articles found for sentiment analysis."
 
-    # Calculate metrics
-    avg_polarity = total_polarity / valid_articles
-    avg_subjectivity = total_subjectivity / valid_articles
-    std_polarity = np.std(polarities) if len(polarities) > 1 else 0
+    texts = [normalize_text(article_text(article)) for article in articles]
+    valid = np.array([bool(text) for text in texts], dtype=bool)
+    to_score = [text for text, ok in zip(texts, valid) if ok]
 
-    # Determine overall sentiment
-    if avg_polarity > 0.1:
-        sentiment_result = "Positive"
-    elif avg_polarity < -0.1:
-        sentiment_result = "Negative"
+    if use_cache:
+        keys = [text_hash(text) for text in to_score]
+        cached = {
+            key: entry for key, entry in get_sentiment_cache().get_many(keys).items()
+            if entry[2] == MODEL_VERSION
+        }
+        # Only texts without a current-version score cost CPU
+        misses = list(dict.fromkeys(text for text, key in zip(to_score, keys) if key not in cached))
+        fresh = dict(zip(misses, _score_uncached(misses, workers)))
+        new_entries = {text_hash(text): [p, s, MODEL_VERSION] for text, (p, s) in fresh.items()}
+        get_sentiment_cache().set_many(new_entries)
+        cached.update(new_entries)
+        scores = [tuple(cached[key][:2]) for key in keys]
     else:
-        sentiment_result = "Neutral"
+        scores = _score_uncached(to_score, workers)
+
+    polarity = np.zeros(len(texts), dtype=np.float64)
+    subjectivity = np.zeros(len(texts), dtype=np.float64)
+    if scores:
+        scored = np.asarray(scores, dtype=np.float64)
+        polarity[valid] = scored[:, 0]
+        subjectivity[valid] = scored[:, 1]
 
-    # Add confidence level based on standard deviation
-    confidence = "High" if std_polarity < 0.3 else "Medium" if std_polarity < 0.5 else "Low"
+    labels = np.where(polarity > 0.1, "Positive", np.where(polarity < -0.1, "Negative", "Neutral")).tolist()
+    return SentimentBatch(polarity=polarity, subjectivity=subjectivity, valid=valid, labels=labels)
+
+
+def format_sentiment(batch: SentimentBatch) -> str:
+    """Human-readable summary of a batch's aggregate sentiment."""
+    if batch.count == 0:
+        return "No valid articles found for sentiment analysis."
 
     return (
-        f"Overall Sentiment: {sentiment_result}\n"
-        f"Polarity Score: {avg_polarity:.2f}\n"
-        f"Subjectivity Score: {avg_subjectivity:.2f}\n"
-        f"Confidence: {confidence}\n"
-        f"Analyzed: {valid_articles} article(s)"
+        f"Overall Sentiment: {batch.overall}\n"
+        f"Polarity Score: {batch.avg_polarity:.2f}\n"
+        f"Subjectivity Score: {batch.avg_subjectivity:.2f}\n"
+        f"Confidence: {batch.confidence}\n"
+        f"Analyzed: {batch.count} article(s)"
     )
+
+
+def analyze_sentiment(articles):
+    """
+    Analyzes sentiment for a list of articles and returns an overall sentiment score.
+
+    Args:
+        articles: List of article texts or list of dictionaries containing article data
+
+    Returns:
+        str: Formatted string containing sentiment analysis results
+    """
+    batch = score_articles(articles)
+    if batch.count == 0:
+        print("No valid articles found for sentiment analysis.")  # Debugging line
+    return format_sentiment(batch)
+
+
+def sentiment_by_coin(articles, tickers=None) -> dict:
+    """
+    Scores the articles once and groups the scores by the coins each article mentions.
+
+    Args:
+        articles: List of article texts or dictionaries
+        tickers: Coins to report (defaults to every coin mentioned)
+
+    Returns:
+        dict: symbol -> SentimentBatch of the articles mentioning it; coins no
+        article mentions get an empty batch
+    """
+    from modules.entity_index import get_entity_index
+
+    if isinstance(articles, str):
+        articles = [articles]
+    batch = score_articles(articles)
+    index = get_entity_index()
+    mentions = [set(index.tickers(article_text(article))) for article in articles]
+    if tickers is None:
+        tickers = list(dict.fromkeys(symbol for found in mentions for symbol in sorted(found)))
+
+    by_coin = {}
+    for ticker in tickers:
+        rows = np.array([ticker in found for found in mentions], dtype=bool)
+        by_coin[ticker] = SentimentBatch(
+            polarity=batch.polarity[rows],
+            subjectivity=batch.subjectivity[rows],
+            valid=batch.valid[rows],
+            labels=[label for label, keep in zip(batch.labels, rows) if keep],
+        )
+    return by_coin
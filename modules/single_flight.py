@@ -0,0 +1,95 @@
+import os
+import time
+import functools
+import threading
+from concurrent.futures import Future
+
+from modules.tracing import trace
+
+# How long a finished result keeps being served to new callers with the same key
+FRESH_FOR = float(os.getenv("SINGLE_FLIGHT_FRESH_SECONDS", "5"))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls.
+
+    The first caller for a key runs the fetch; callers arriving while it is in
+    flight wait for and share its result (or exception). A successful result
+    is then reused for `fresh_for` seconds before the next call fetches again.
+    """
+
+    def __init__(self, fresh_for: float = FRESH_FOR):
+        self.fresh_for = fresh_for
+        self._inflight = {}
+        self._done = {}  # key -> (finished_at, result)
+        self._lock = threading.Lock()
+
+    def do(self, key, fetch):
+        with self._lock:
+            done = self._done.get(key)
+            if done is not None and time.monotonic() - done[0] < self.fresh_for:
+                trace("single_flight.fresh", key=key[0] if isinstance(key, tuple) else key)
+                return done[1]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            trace("single_flight.shared", key=key[0] if isinstance(key, tuple) else key)
+            return future.result()
+
+        try:
+            result = fetch()
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            if self.fresh_for > 0:
+                self._done[key] = (time.monotonic(), result)
+                self._expire()
+        future.set_result(result)
+        return result
+
+    def _expire(self):
+        now = time.monotonic()
+        for key in [key for key, (finished_at, _) in self._done.items() if now - finished_at >= self.fresh_for]:
+            del self._done[key]
+
+    def forget(self, key=None):
+        """Drops a fresh result (or all of them) so the next call fetches again."""
+        with self._lock:
+            if key is None:
+                self._done.clear()
+            else:
+                self._done.pop(key, None)
+
+
+def single_flight(fresh_for: float = FRESH_FOR, copy=None):
+    """
+    Decorator that puts a SingleFlight in front of a fetcher. Calls are keyed
+    by the function and its (hashable) arguments.
+
+    Args:
+        fresh_for (float): Seconds a finished result is reused.
+        copy (callable): Applied to the shared result for each caller, for
+            results that callers mutate (e.g. DataFrame.copy).
+    """
+    def decorator(func):
+        flight = SingleFlight(fresh_for)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            result = flight.do(key, lambda: func(*args, **kwargs))
+            return copy(result) if copy is not None else result
+
+        wrapper.flight = flight
+        return wrapper
+
+    return decorator
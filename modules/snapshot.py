@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+from config.settings import NEWS_SETTINGS, SCHEDULER_SETTINGS
+
+SNAPSHOT_DIR = os.path.join("data", "snapshot")
+MANIFEST = "manifest.json"
+# Older versions are kept briefly so dashboards still reading them are not cut off
+KEEP_VERSIONS = 3
+# Daily bars: a series whose newest bar opened longer ago than this has missed a bar
+STALE_BAR_SECONDS = 2 * 86400
+
+_build_lock = threading.Lock()
+
+
+class Snapshot:
+    """
+    One precomputed, read-only view of everything the dashboard renders.
+
+    Arrays are memory-mapped from .npy files; `articles`, `aggregates` and
+    `events` come from the manifest-referenced JSON.
+    """
+
+    def __init__(self, directory: str, manifest: dict):
+        self.directory = directory
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.created_at = manifest["created_at"]
+        self.aggregates = manifest["aggregates"]
+
+        with open(os.path.join(directory, "articles.json"), "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        self.articles = payload["articles"]
+        self.events = payload["events"]
+        self.arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in manifest["arrays"]
+        }
+
+    def series(self, ticker: str):
+        """Returns (epoch seconds, close) arrays for a ticker, or None if it is not in the snapshot."""
+        key = _series_key(ticker)
+        if f"{key}.time" not in self.arrays:
+            return None
+        return self.arrays[f"{key}.time"], self.arrays[f"{key}.close"]
+
+    def price_frame(self, ticker: str, days: int):
+        """
+        Returns the last `days` days of a ticker's closes as a DataFrame shaped
+        like fetch_crypto_price_data's, or None if the snapshot does not cover
+        them or its newest bar is stale (callers then fetch live data).
+        """
+        import pandas as pd
+
+        series = self.series(ticker)
+        if series is None or days > self.manifest["price_history_days"]:
+            return None
+        times, closes = series
+        if not len(times) or time.time() - int(times[-1]) > STALE_BAR_SECONDS:
+            return None
+        start = date.today() - timedelta(days=days)
+        lo = np.searchsorted(times, pd.Timestamp(start).timestamp())
+        df = pd.DataFrame({"close": closes[lo:]}, index=pd.to_datetime(times[lo:], unit="s"))
+        df.index.name = "timestamp"
+        return df
+
+
+def _series_key(ticker: str) -> str:
+    return "series." + "".join(ch if ch.isalnum() else "_" for ch in ticker.strip().upper())
+
+
+def _manifest_path(root):
+    return os.path.join(root, MANIFEST)
+
+
+def snapshot_version(root: str = SNAPSHOT_DIR):
+    """Cheap check of the current snapshot version (None if none has been written)."""
+    try:
+        with open(_manifest_path(root), "r", encoding="utf-8") as f:
+            return json.load(f)["version"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def snapshot_is_current(root: str = SNAPSHOT_DIR) -> bool:
+    """True when a snapshot exists and was built from the article store's current version."""
+    from modules.article_store import get_store
+    try:
+        with open(_manifest_path(root), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return manifest.get("corpus_version") == get_store().version()
+
+
+def load_snapshot(root: str = SNAPSHOT_DIR):
+    """Loads the current snapshot, or returns None if none has been written yet."""
+    try:
+        with open(_manifest_path(root), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return Snapshot(os.path.join(root, manifest["version"]), manifest)
+
+
+def _price_series(tickers, days, local_only=False) -> dict:
+    from modules.price_cache import get_candle_cache
+    today = date.today()
+    start = today - timedelta(days=days)
+    arrays = {}
+    for ticker in tickers:
+        try:
+            if local_only:
+                candles = get_candle_cache().cached(ticker.strip(), start, today)
+            else:
+                candles = get_candle_cache().get(ticker.strip(), start, today)
+        except Exception as e:
+            logging.warning(f"⚠️ Snapshot skipped {ticker} prices: {e}")
+            continue
+        if len(candles["time"]):
+            key = _series_key(ticker)
+            arrays[f"{key}.time"] = np.ascontiguousarray(candles["time"])
+            arrays[f"{key}.close"] = np.ascontiguousarray(candles["close"])
+    return arrays
+
+
+def build_snapshot(root: str = SNAPSHOT_DIR, tickers=None, days: int = None, events=None,
+                   local_only: bool = False) -> str:
+    """
+    Precomputes the dashboard's data from local stores and writes it as a new
+    snapshot version: latest articles, per-article sentiment arrays,
+    aggregates, price series and regulatory events.
+
+    Args:
+        tickers (list): Price series to include (defaults to the scheduler's).
+        days (int): Days of price history per series.
+        events (list): Regulatory documents; defaults to those of the current snapshot.
+        local_only (bool): Only include price bars already in the candle cache,
+            so the build never waits on the price API (e.g. from the dashboard).
+
+    Returns:
+        str: The version now being served (unchanged if the data was identical).
+    """
+    with _build_lock:
+        return _build(root, tickers, days, events, local_only)
+
+
+def _build(root, tickers, days, events, local_only) -> str:
+    from modules.article_store import get_store
+    from modules.sentiment import score_articles
+
+    tickers = tickers or SCHEDULER_SETTINGS["price_tickers"]
+    days = days or SCHEDULER_SETTINGS["price_history_days"]
+    if events is None:
+        current = load_snapshot(root)
+        events = current.events if current is not None else []
+
+    corpus_version = get_store().version()
+    articles = get_store().latest(NEWS_SETTINGS["latest_limit"])
+    batch = score_articles(articles)
+    arrays = {
+        "sentiment.polarity": batch.polarity,
+        "sentiment.subjectivity": batch.subjectivity,
+        "sentiment.valid": batch.valid,
+        "sentiment.labels": np.asarray(batch.labels, dtype="U8"),
+    }
+    arrays.update(_price_series(tickers, days, local_only))
+
+    labels, counts = np.unique(arrays["sentiment.labels"], return_counts=True)
+    aggregates = {
+        "article_count": len(articles),
+        "label_counts": {str(label): int(count) for label, count in zip(labels, counts)},
+        "avg_polarity": float(batch.polarity.mean()) if len(articles) else 0.0,
+        "overall": batch.overall,
+        "confidence": batch.confidence,
+    }
+
+    digest = hashlib.sha256(json.dumps([corpus_version, articles, events], sort_keys=True, default=str).encode("utf-8"))
+    for name in sorted(arrays):
+        digest.update(name.encode("utf-8"))
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    version = digest.hexdigest()[:16]
+    if snapshot_version(root) == version:
+        return version
+
+    # Write the version directory fully, then switch the manifest over atomically
+    directory = os.path.join(root, version)
+    tmp_directory = directory + ".tmp"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp_directory, f"{name}.npy"), values)
+    with open(os.path.join(tmp_directory, "articles.json"), "w", encoding="utf-8") as f:
+        json.dump({"articles": articles, "events": events}, f, ensure_ascii=False)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_directory, directory)
+
+    manifest = {
+        "version": version,
+        "created_at": time.time(),
+        "arrays": sorted(arrays),
+        "price_history_days": days,
+        "corpus_version": corpus_version,
+        "aggregates": aggregates,
+    }
+    tmp_manifest = _manifest_path(root) + ".tmp"
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_manifest, _manifest_path(root))
+    logging.info(f"✅ Wrote dashboard snapshot {version} ({len(articles)} articles)")
+
+    _prune(root, keep=version)
+    return version
+
+
+def _prune(root, keep):
+    versions = [
+        entry for entry in os.scandir(root)
+        if entry.is_dir() and not entry.name.endswith(".tmp") and entry.name != keep
+    ]
+    versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,172 @@
+import os
+import time
+import queue
+import threading
+import contextvars
+from dataclasses import dataclass
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+TOKEN = "token"
+TOOL_START = "tool_start"
+TOOL_END = "tool_end"
+
+# ReAct agents think out loud; only text after this marker is the answer
+FINAL_ANSWER_PREFIX = "Final Answer:"
+
+
+@dataclass
+class StreamEvent:
+    """One streamed item: an answer token, or a tool starting/finishing."""
+    kind: str
+    text: str
+
+
+def chat_backend() -> str:
+    """Returns the backend selected by CHAT_BACKEND ("openai" or "fake")."""
+    return os.getenv("CHAT_BACKEND", "openai").lower()
+
+
+class QueueCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback that forwards tokens and tool calls to a queue.
+
+    With `final_answer_prefix`, tokens are held back until the prefix has
+    been generated, so a ReAct agent's thoughts and actions are not streamed.
+    """
+
+    def __init__(self, events: queue.Queue, final_answer_prefix: str = None):
+        self.events = events
+        self.final_answer_prefix = final_answer_prefix
+        self.streamed_tokens = 0
+        self._buffer = ""
+        self._answering = final_answer_prefix is None
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        if self.final_answer_prefix is not None:
+            self._buffer = ""
+            self._answering = False
+
+    on_chat_model_start = on_llm_start
+
+    def on_llm_new_token(self, token: str, **kwargs):
+        if not self._answering:
+            self._buffer += token
+            if self.final_answer_prefix not in self._buffer:
+                return
+            self._answering = True
+            token = self._buffer.split(self.final_answer_prefix, 1)[1]
+        if not self.streamed_tokens:
+            token = token.lstrip()
+            if not token:
+                return
+        self.streamed_tokens += 1
+        self.events.put(StreamEvent(TOKEN, token))
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self.events.put(StreamEvent(TOOL_START, (serialized or {}).get("name", "tool")))
+
+    def on_tool_end(self, output, **kwargs):
+        self.events.put(StreamEvent(TOOL_END, str(output)))
+
+
+_DONE = object()
+
+
+def stream_langchain(run, final_answer_prefix: str = None):
+    """
+    Runs a LangChain call in a worker thread and yields its StreamEvents as
+    they happen.
+
+    Args:
+        run: Callable taking `callbacks` (a handler list) and returning the
+            final answer, e.g. lambda callbacks: chain.run(query, callbacks=callbacks).
+        final_answer_prefix (str): Marker before which tokens are not streamed.
+
+    If the model produced no streamed tokens (e.g. streaming is unsupported),
+    the final answer is yielded as a single token. Errors are re-raised.
+    """
+    events = queue.Queue()
+    handler = QueueCallbackHandler(events, final_answer_prefix)
+    outcome = {}
+    # The worker sees the caller's request context (memoized fetches)
+    context = contextvars.copy_context()
+
+    def worker():
+        try:
+            outcome["result"] = context.run(run, [handler])
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            events.put(_DONE)
+
+    threading.Thread(target=worker, daemon=True).start()
+    while True:
+        event = events.get()
+        if event is _DONE:
+            break
+        yield event
+
+    if "error" in outcome:
+        raise outcome["error"]
+    if not handler.streamed_tokens and outcome.get("result"):
+        yield StreamEvent(TOKEN, str(outcome["result"]))
+
+
+def stream_call(func, *args, **kwargs):
+    """Streams a plain (non-LLM) call: its whole result arrives as one token."""
+    yield StreamEvent(TOKEN, str(func(*args, **kwargs)))
+
+
+class FakeStreamingLLM:
+    """Offline model that streams a canned reply word by word; for tests and dry runs."""
+
+    model = "fake"
+
+    def __init__(self, response: str = None, delay: float = 0.02, tools=(), preamble: str = ""):
+        self.response = response
+        self.delay = delay
+        self.tools = tools
+        # Streamed before the reply, e.g. a ReAct "Thought: ... Final Answer:" lead-in
+        self.preamble = preamble
+        self.calls = 0
+
+    def reply(self, prompt: str) -> str:
+        return self.response or f"This is a streamed answer to: {prompt}"
+
+    def stream(self, prompt: str):
+        self.calls += 1
+        text = f"{self.preamble} {self.reply(prompt)}" if self.preamble else self.reply(prompt)
+        for i, word in enumerate(text.split(" ")):
+            if self.delay:
+                time.sleep(self.delay)
+            yield StreamEvent(TOKEN, word if i == 0 else f" {word}")
+
+    def run(self, prompt: str, callbacks=()) -> str:
+        """Mimics a LangChain call: tool callbacks first, then token callbacks."""
+        for name in self.tools:
+            for handler in callbacks:
+                handler.on_tool_start({"name": name}, prompt)
+                handler.on_tool_end(f"{name} output")
+        for handler in callbacks:
+            handler.on_llm_start({}, [prompt])
+        for event in self.stream(prompt):
+            for handler in callbacks:
+                handler.on_llm_new_token(event.text)
+        return self.reply(prompt)
+
+    # Same call shape as a LangChain LLM's predict()
+    predict = run
+
+
+def answer_tokens(events, on_tool=None):
+    """
+    Yields only the answer text of a StreamEvent stream (e.g. for
+    st.write_stream), so the returned answer carries no tool status lines.
+    Each starting tool's name is passed to `on_tool` instead.
+    """
+    for event in events:
+        if event.kind == TOKEN:
+            yield event.text
+        elif event.kind == TOOL_START and on_tool is not None:
+            on_tool(event.text)
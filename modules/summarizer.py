@@ -1,35 +1,124 @@
 import os
-from langchain.chat_models import ChatOpenAI
-from langchain.schema import HumanMessage
-from modules.fetch_news import fetch_news
+import asyncio
+import hashlib
+import threading
+from modules.article_store import get_store
+from modules.kv_cache import PersistentCache
 
-def summarize_articles():
-    # Fetch articles from your local news fetcher
-    articles = fetch_news()
-    if not articles:
-        return []
+SUMMARY_PROMPT = (
+    "Summarize the following news article in two sentences:\n\n"
+    "Title: {title}\n"
+    "Content: {content}"
+)
+CACHE_PATH = os.path.join("data", "summary_cache.db")
+CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "20000"))
+
+
+class OpenAISummaryLLM:
+    """GPT-4 chat backend (ensure your OPENAI_API_KEY is set in your environment)."""
+
+    def __init__(self, model: str = "gpt-4"):
+        from langchain.chat_models import ChatOpenAI
+
+        self.model = model
+        self._llm = ChatOpenAI(model=model, openai_api_key=os.getenv("OPENAI_API_KEY"))
+
+    async def acomplete(self, prompt: str) -> str:
+        from langchain.schema import HumanMessage
+
+        message = await self._llm.ainvoke([HumanMessage(content=prompt)])
+        return message.content
+
+
+class FakeSummaryLLM:
+    """Offline backend that echoes the article title; for tests and dry runs."""
+
+    model = "fake"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def acomplete(self, prompt: str) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        title = next((line[len("Title: "):] for line in prompt.splitlines() if line.startswith("Title: ")), "")
+        return f"Summary of: {title}"
+
+
+def get_summary_llm():
+    """Returns the backend selected by SUMMARIZER_BACKEND ("openai" or "fake")."""
+    if os.getenv("SUMMARIZER_BACKEND", "openai").lower() == "fake":
+        return FakeSummaryLLM()
+    return OpenAISummaryLLM()
 
-    # Initialize the LLM (ensure your OPENAI_API_KEY is set in your environment)
-    llm = ChatOpenAI(model="gpt-4", openai_api_key=os.getenv("OPENAI_API_KEY"))
-    
-    summaries = []
-    # Limit to first 5 articles for efficiency
-    for article in articles[:5]:
-        prompt = (
-            "Summarize the following news article in two sentences:\n\n"
-            f"Title: {article.get('title', 'No title')}\n"
-            f"Content: {article.get('content', 'No content')}"
-        )
-        # Create a human message with the prompt
-        message = HumanMessage(content=prompt)
-        # Get the summary from the LLM
-        summary = llm([message]).content
-        summaries.append({
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> PersistentCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PersistentCache(CACHE_PATH, max_entries=CACHE_SIZE)
+        return _cache
+
+
+def summary_key(prompt: str, model: str) -> str:
+    """Cache key over the article (embedded in the prompt), prompt template and model."""
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+async def summarize_articles_async(articles, limit: int = 5, llm=None, concurrency: int = 4) -> list:
+    """
+    Summarizes up to `limit` articles concurrently, at most `concurrency` LLM calls at a time.
+    Summaries already cached for the same article, prompt and model are reused.
+    """
+    llm = llm or get_summary_llm()
+    cache = get_summary_cache()
+    selected = [article for article in articles if article][:limit]
+
+    prompts = [
+        SUMMARY_PROMPT.format(title=article.get('title', 'No title'),
+                              content=article.get('content', 'No content'))
+        for article in selected
+    ]
+    keys = [summary_key(prompt, llm.model) for prompt in prompts]
+    cached = cache.get_many(keys)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def summarize(prompt, key):
+        if key in cached:
+            return cached[key]
+        async with semaphore:
+            summary = await llm.acomplete(prompt)
+        cache.set(key, summary)
+        return summary
+
+    summaries = await asyncio.gather(*(summarize(p, k) for p, k in zip(prompts, keys)))
+    return [
+        {
             "title": article.get("title", "No title"),
             "summary": summary,
             "url": article.get("url", "#")
-        })
-    return summaries
+        }
+        for article, summary in zip(selected, summaries)
+    ]
+
+
+def summarize_articles(articles=None, limit: int = 5, llm=None, concurrency: int = 4) -> list:
+    """
+    Summarizes already-fetched articles; defaults to the latest stored articles
+    rather than calling the news API again.
+    """
+    if articles is None:
+        articles = get_store().latest(limit)
+    if not articles:
+        return []
+    return asyncio.run(summarize_articles_async(articles, limit=limit, llm=llm, concurrency=concurrency))
 
 if __name__ == "__main__":
     results = summarize_articles()
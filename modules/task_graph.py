@@ -0,0 +1,93 @@
+import time
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskGraph:
+    """
+    Minimal dependency-aware executor for I/O-bound stages.
+
+    Each task starts as soon as all of its dependencies have succeeded, so
+    independent stages run concurrently. A task that fails or exceeds its
+    timeout is reported in `errors` and every task depending on it is
+    skipped; the other results are still returned.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._tasks = {}
+
+    def add(self, name: str, func, deps=(), timeout: float = None):
+        """
+        Registers a task. `func` receives the results of `deps` as keyword
+        arguments named after the dependencies.
+        """
+        for dep in deps:
+            if dep not in self._tasks:
+                raise ValueError(f"Unknown dependency '{dep}' for task '{name}'")
+        self._tasks[name] = {"func": func, "deps": tuple(deps), "timeout": timeout}
+        return self
+
+    def run(self) -> dict:
+        """
+        Runs every task and returns a report:
+            results: {name: value} for tasks that completed
+            errors:  {name: message} for tasks that failed, timed out or were skipped
+            timings: {name: seconds} wall time per started task
+        """
+        results, errors, timings = {}, {}, {}
+        done = threading.Condition()
+        finished = set()
+        # Worker threads inherit the caller's context (e.g. an active request context)
+        context = contextvars.copy_context()
+
+        def run_task(name, task):
+            start = time.perf_counter()
+            kwargs = {dep: results[dep] for dep in task["deps"]}
+            try:
+                value, error = context.copy().run(task["func"], **kwargs), None
+            except Exception as e:
+                value, error = None, f"{type(e).__name__}: {e}"
+            with done:
+                if name in finished:
+                    return  # Already reported as timed out
+                if error is None:
+                    results[name] = value
+                else:
+                    errors[name] = error
+                timings[name] = time.perf_counter() - start
+                finished.add(name)
+                done.notify_all()
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        started = {}
+        try:
+            while len(finished) < len(self._tasks):
+                with done:
+                    for name, task in self._tasks.items():
+                        if name in started or name in finished:
+                            continue
+                        if any(dep in errors for dep in task["deps"]):
+                            errors[name] = "skipped: dependency failed"
+                            finished.add(name)
+                        elif all(dep in results for dep in task["deps"]):
+                            started[name] = time.perf_counter()
+                            pool.submit(run_task, name, task)
+
+                    now = time.perf_counter()
+                    for name, start in started.items():
+                        timeout = self._tasks[name]["timeout"]
+                        if name not in finished and timeout is not None and now - start > timeout:
+                            # The thread cannot be killed; its late result is discarded
+                            errors[name] = f"timed out after {timeout}s"
+                            timings[name] = now - start
+                            finished.add(name)
+
+                    if len(finished) < len(self._tasks):
+                        done.wait(timeout=0.05)
+        finally:
+            pool.shutdown(wait=False)
+
+        with done:
+            return {"results": dict(results), "errors": dict(errors), "timings": dict(timings)}
@@ -1,5 +1,10 @@
+import sys
 import os
-from price_agent import PriceAgent
+
+# Ensure Python finds the `modules` package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from modules.price_agent import PriceAgent
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -0,0 +1,45 @@
+import os
+import time
+import random
+import logging
+from contextlib import contextmanager
+
+# ZCRYPTO_TRACE: "off", "info" or "debug"; ZCRYPTO_TRACE_SAMPLE: fraction of debug events kept
+_LEVELS = {"off": None, "info": logging.INFO, "debug": logging.DEBUG}
+TRACE_LEVEL = _LEVELS.get(os.getenv("ZCRYPTO_TRACE", "info").lower(), logging.INFO)
+SAMPLE_RATE = float(os.getenv("ZCRYPTO_TRACE_SAMPLE", "0.1"))
+
+logger = logging.getLogger("zcrypto.trace")
+if TRACE_LEVEL is not None:
+    logger.setLevel(TRACE_LEVEL)
+
+
+def enabled(level: int = logging.DEBUG) -> bool:
+    return TRACE_LEVEL is not None and level >= TRACE_LEVEL
+
+
+def trace(event: str, level: int = logging.DEBUG, **fields):
+    """
+    Logs one compact trace line with sizes, counts and timings (never bodies).
+    Debug events are sampled at ZCRYPTO_TRACE_SAMPLE; info and above always pass.
+    """
+    if not enabled(level):
+        return
+    if level <= logging.DEBUG and random.random() >= SAMPLE_RATE:
+        return
+    details = " ".join(f"{key}={value}" for key, value in fields.items())
+    logger.log(level, f"🔍 {event} {details}".rstrip())
+
+
+@contextmanager
+def span(event: str, level: int = logging.DEBUG, **fields):
+    """
+    Times a block and traces it on exit; the block may add fields to the
+    yielded dict (e.g. bytes read, records parsed).
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        fields["elapsed_ms"] = f"{(time.perf_counter() - start) * 1000:.1f}"
+        trace(event, level, **fields)
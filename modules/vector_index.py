@@ -0,0 +1,171 @@
+import os
+import re
+import json
+import hashlib
+import threading
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+INDEX_DIR = os.path.join("data", "vector_index")
+
+
+def content_hash(text: str) -> str:
+    """Stable key for a chunk of text."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic, offline embedder using signed feature hashing of word tokens.
+
+    Useful for tests and for running the chatbot without embedding spend;
+    retrieval quality is lexical rather than semantic.
+    """
+
+    name = "local-hashing"
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _embed(self, text: str) -> list:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def get_embeddings():
+    """
+    Returns the embedder selected by EMBEDDINGS_BACKEND ("openai" or "local").
+    """
+    backend = os.getenv("EMBEDDINGS_BACKEND", "openai").lower()
+    if backend == "local":
+        return HashingEmbeddings()
+
+    from langchain_community.embeddings import OpenAIEmbeddings
+    return OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def embedder_name(embeddings) -> str:
+    """Directory-safe identifier so vectors from different embedders never mix."""
+    name = getattr(embeddings, "name", None)
+    if not name:
+        model = getattr(embeddings, "model", None)
+        name = f"{type(embeddings).__name__}-{model}" if model else type(embeddings).__name__
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+class VectorIndex:
+    """
+    Persistent content-hash -> vector table.
+
+    Vectors live in an append-only float32 file that is memory-mapped for
+    reads, with a parallel append-only list of chunk hashes. Only texts whose
+    hash is not already present are sent to the embedder.
+    """
+
+    def __init__(self, embeddings, directory: str = INDEX_DIR):
+        self.embeddings = embeddings
+        self.directory = os.path.join(directory, embedder_name(embeddings))
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._hashes_path = os.path.join(self.directory, "hashes.txt")
+        self._meta_path = os.path.join(self.directory, "meta.json")
+
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._dim = None
+        self._matrix = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            self._dim = json.load(f)["dim"]
+
+        hashes = []
+        if os.path.exists(self._hashes_path):
+            with open(self._hashes_path, "r", encoding="utf-8") as f:
+                hashes = [line.strip() for line in f if line.strip()]
+        row_bytes = self._dim * np.dtype(np.float32).itemsize
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+
+        # A crash between the two appends can leave the files out of step; keep the common prefix
+        rows = min(len(hashes), size // row_bytes)
+        if rows != len(hashes):
+            hashes = hashes[:rows]
+            with open(self._hashes_path, "w", encoding="utf-8") as f:
+                f.writelines(h + "\n" for h in hashes)
+        if size != rows * row_bytes:
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(rows * row_bytes)
+
+        self._rows = {h: i for i, h in enumerate(hashes)}
+        self._remap()
+
+    def _remap(self):
+        if not self._rows:
+            self._matrix = None
+            return
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r",
+                                 shape=(len(self._rows), self._dim))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def embed(self, texts) -> np.ndarray:
+        """
+        Returns one vector per text, embedding only texts not seen before.
+        """
+        hashes = [content_hash(text) for text in texts]
+        with self._lock:
+            missing = {}
+            for text, h in zip(texts, hashes):
+                if h not in self._rows and h not in missing:
+                    missing[h] = text
+
+            if missing:
+                vectors = np.asarray(self.embeddings.embed_documents(list(missing.values())),
+                                     dtype=np.float32)
+                if self._dim is None:
+                    self._dim = vectors.shape[1]
+                    with open(self._meta_path, "w", encoding="utf-8") as f:
+                        json.dump({"dim": self._dim}, f)
+                with open(self._vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+                with open(self._hashes_path, "a", encoding="utf-8") as f:
+                    for h in missing:
+                        self._rows[h] = len(self._rows)
+                        f.write(h + "\n")
+                self._remap()
+
+            if not hashes:
+                return np.empty((0, self._dim or 0), dtype=np.float32)
+            return np.asarray(self._matrix[[self._rows[h] for h in hashes]])
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(embeddings=None) -> VectorIndex:
+    """Returns the process-wide index for the configured embedder."""
+    embeddings = embeddings or get_embeddings()
+    key = embedder_name(embeddings)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = VectorIndex(embeddings)
+        return _indexes[key]
@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
-from langchain.agents import initialize_agent, Tool
-from langchain_community.llms import OpenAI
+
+from modules.agent_registry import get_agent
 
 # ✅ Load environment variables
 load_dotenv()
@@ -15,6 +15,8 @@ def create_web_search_agent():
         print("⚠️ SerpAPI key is missing. Web search will be disabled.")
         return None  # ✅ Prevents the agent from initializing when there's no API key
 
+    from langchain.agents import initialize_agent, Tool
+    from langchain_community.llms import OpenAI
     from langchain_community.utilities import SerpAPIWrapper  # ✅ Import only when needed
     search = SerpAPIWrapper(serpapi_api_key=SERPAPI_API_KEY)
 
@@ -38,7 +40,7 @@ def create_web_search_agent():
 
 def ask_web_search_agent(query: str) -> str:
     """Asks the web search agent a question, returning a string answer."""
-    agent = create_web_search_agent()
+    agent = get_agent("web_search", create_web_search_agent)
     
     if agent is None:
         return "Web search is disabled because SerpAPI key is missing."